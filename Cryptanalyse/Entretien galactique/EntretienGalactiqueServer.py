@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# EntretienGalactiqueServer.py — rejeu local du challenge derrière un serveur TCP asyncio
+#
+# Chaque connexion lance EntretienGalactique.py en sous-processus (stdin/stdout reliés
+# à la socket), sans modifier le script du challenge.
+# - --rtt : aller-retour artificiel, la moitié du délai dans chaque sens ; les paquets
+#   gardent leur ordre (file horodatée), comme sur un vrai lien
+# - --seed : os.urandom et random sont reseedés dans le sous-processus, donc mêmes
+#   triplets et mêmes questions à chaque connexion
+# - --bench : lance le solveur contre le serveur pour chaque RTT et mesure la marge
+#   sur le contrôle t2 - t1 < 5 du challenge
+#
+# Exemple :
+#   python3 EntretienGalactiqueServer.py --port 30069 --rtt 0.05 --seed 1
+#   python3 solve_EntretienGalatiqueSock.py --host 127.0.0.1 --port 30069
+#   python3 EntretienGalactiqueServer.py --bench --rtt 0 0.05 0.2
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Lanceur déterministe : le challenge tire os.urandom (triplets) et random (prénom, questions)
+RUNNER = ("import os, random, runpy, sys; random.seed(int(sys.argv[1])); os.urandom = random.randbytes; "
+          "runpy.run_path('EntretienGalactique.py', run_name='__main__')")
+
+
+async def _pump(reader, writer, delay):
+    # Copie reader -> writer avec delay secondes de retard par paquet
+    loop = asyncio.get_running_loop()
+    file = asyncio.Queue()
+
+    async def livrer():
+        try:
+            while True:
+                due, data = await file.get()
+                if data is None:
+                    break
+                attente = due - loop.time()
+                if attente > 0:
+                    await asyncio.sleep(attente)
+                writer.write(data)
+                await writer.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    tache = asyncio.create_task(livrer())
+    while True:
+        data = await reader.read(65536)
+        await file.put((loop.time() + delay, data or None))
+        if not data:
+            break
+    await tache
+
+
+def make_handler(rtt, seed, actives=None):
+    # actives : ensemble optionnel des connexions en cours, pour les attendre avant l'arrêt
+    async def handle(client_reader, client_writer):
+        if actives is not None:
+            actives.add(asyncio.current_task())
+        if seed is None:
+            cmd = [sys.executable, "-u", "EntretienGalactique.py"]
+        else:
+            cmd = [sys.executable, "-u", "-c", RUNNER, str(seed)]
+        proc = await asyncio.create_subprocess_exec(*cmd, cwd=HERE, stdin=asyncio.subprocess.PIPE,
+                                                    stdout=asyncio.subprocess.PIPE,
+                                                    stderr=asyncio.subprocess.DEVNULL)
+        try:
+            await asyncio.gather(_pump(client_reader, proc.stdin, rtt / 2),
+                                 _pump(proc.stdout, client_writer, rtt / 2))
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+            await proc.wait()
+            if actives is not None:
+                actives.discard(asyncio.current_task())
+    return handle
+
+
+async def serve(host, port, rtt, seed):
+    server = await asyncio.start_server(make_handler(rtt, seed), host, port)
+    print(f"[*] Entretien galactique local sur {host}:{port} (RTT {1e3 * rtt:.0f} ms, seed {seed})")
+    async with server:
+        await server.serve_forever()
+
+
+async def bench(rtts, seed):
+    from solve_EntretienGalatiqueSock import solve_entretien_rh_socket, print_timings
+    for rtt in rtts:
+        actives = set()
+        server = await asyncio.start_server(make_handler(rtt, seed, actives), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        print(f"\n=== RTT {1e3 * rtt:.0f} ms ===")
+        t0 = time.perf_counter()
+        final, mesures = await asyncio.to_thread(solve_entretien_rh_socket, "127.0.0.1", port, False, False)
+        print_timings(mesures, time.perf_counter() - t0, rtt)
+        await asyncio.gather(*actives)    # le sous-processus peut finir après le client
+        server.close()
+        await server.wait_closed()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Serveur local pour EntretienGalactique.py")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=30069)
+    ap.add_argument("--rtt", type=float, nargs="+", default=[0.0], help="aller-retour artificiel (s)")
+    ap.add_argument("--seed", type=int, default=None, help="tirages déterministes")
+    ap.add_argument("--bench", action="store_true", help="mesure le solveur pour chaque --rtt")
+    args = ap.parse_args()
+    if args.bench:
+        asyncio.run(bench(args.rtt, 1 if args.seed is None else args.seed))
+    else:
+        asyncio.run(serve(args.host, args.port, args.rtt[0], args.seed))
@@ -0,0 +1,103 @@
+# Inversion des sommes de puissances pour k inconnues entières
+#
+# Donnés p_j = x_1^j + ... + x_k^j pour j = 1..k, on retrouve les x_i :
+#   1. Newton-Girard : j*e_j = sum_{i=1..j} (-1)^(i-1) e_{j-i} p_i  (divisions exactes)
+#   2. P(t) = t^k - e_1 t^(k-1) + e_2 t^(k-2) - ... a toutes ses racines réelles :
+#      Newton entier depuis isqrt(sum x_i^2) + 1 (au-dessus de la plus grande racine)
+#      décroît vers cette racine, puis division synthétique exacte et on recommence.
+#
+#   roots_from_power_sums([s1, s2, s3])  ->  (x, y, z) triés
+#   solve_batch(instances)               ->  une liste de tuples, instances traitées en lot
+#
+# Exemple :
+#   python3 power_sums.py       # passage à l'échelle en nombre d'instances et en k
+
+import math
+import os
+import time
+
+
+def elementary_symmetric(ps):
+    # [e_1, ..., e_k] depuis [p_1, ..., p_k] ; ValueError si ce ne sont pas des sommes entières
+    es = [1]
+    for j in range(1, len(ps) + 1):
+        acc = 0
+        for i in range(1, j + 1):
+            terme = es[j - i] * ps[i - 1]
+            acc += terme if i % 2 else -terme
+        if acc % j:
+            raise ValueError("sommes de puissances incohérentes")
+        es.append(acc // j)
+    return es[1:]
+
+def _largestRoot(coeffs):
+    # coeffs : P(t) = sum coeffs[i] t^(n-i), unitaire, racines réelles entières
+    c1 = coeffs[1]
+    c2 = coeffs[2] if len(coeffs) > 2 else 0
+    borne = math.isqrt(max(c1 * c1 - 2 * c2, 0)) + 1  # sqrt(sum x_i^2) : c1 = -e_1, c2 = e_2
+    t = borne
+    while t >= -borne:
+        v = dv = 0
+        for c in coeffs:            # Horner pour P et P'
+            dv = dv * t + v
+            v = v * t + c
+        if v == 0:
+            return t
+        if v < 0 or dv <= 0:
+            # Sous la plus grande racine réelle (non entière), ou P' <= 0 au-dessus d'elle :
+            # P a des racines complexes (sommes cohérentes mais pas k entiers réels)
+            break
+        t -= max(v // dv, 1)
+    raise ValueError("pas de racine entière")
+
+def integer_roots(es):
+    # Racines entières triées de t^k - e_1 t^(k-1) + ... + (-1)^k e_k
+    coeffs = [1] + [-e if j % 2 == 0 else e for j, e in enumerate(es)]
+    racines = []
+    while len(coeffs) > 1:
+        z = _largestRoot(coeffs)
+        racines.append(z)
+        # Division synthétique par (t - z), reste nul exigé
+        quotient = [coeffs[0]]
+        for c in coeffs[1:]:
+            quotient.append(c + quotient[-1] * z)
+        if quotient.pop() != 0:
+            raise ValueError("pas de racine entière")
+        coeffs = quotient
+    return tuple(reversed(racines))
+
+def roots_from_power_sums(ps):
+    return integer_roots(elementary_symmetric(ps))
+
+def solve_batch(instances):
+    return [roots_from_power_sums(ps) for ps in instances]
+
+
+def _instances(n, k, bits=128):
+    getRand = lambda: int.from_bytes(os.urandom(bits // 8), "big")
+    racines = [tuple(sorted(getRand() for _ in range(k))) for _ in range(n)]
+    return racines, [[sum(x ** j for x in r) for j in range(1, k + 1)] for r in racines]
+
+def bench():
+    # Linéaire en nombre d'instances (k = 3), polynomial en k (n fixé)
+    print("[*] k = 3, racines de 128 bits :")
+    for n in (1000, 2000, 4000, 8000):
+        racines, instances = _instances(n, 3)
+        t0 = time.perf_counter()
+        assert solve_batch(instances) == racines
+        dt = time.perf_counter() - t0
+        print(f"    n = {n:5d} : {dt:.3f} s, {1e6 * dt / n:.1f} µs / instance")
+    print("[*] n = 200, racines de 128 bits :")
+    prec = None
+    for k in (2, 4, 8, 16, 32):
+        racines, instances = _instances(200, k)
+        t0 = time.perf_counter()
+        assert solve_batch(instances) == racines
+        dt = time.perf_counter() - t0
+        pente = f", pente log-log {math.log(dt / prec[1]) / math.log(k / prec[0]):.2f}" if prec else ""
+        print(f"    k = {k:2d} : {1e3 * dt / 200:.2f} ms / instance{pente}")
+        prec = (k, dt)
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,67 @@
+# Lecteur tamponné pour clients netcat : remplace les sock.recv(1) octet par octet.
+#
+# Un bytearray de taille fixe est rempli par de gros recv_into ; les données
+# consommées sont recompactées en tête du tampon (jamais de concaténation data += chunk).
+# recvs compte les appels système, pour mesurer le gain par tour.
+#
+#   reader = SockReader(socket.create_connection((host, port)))
+#   ligne = reader.readline()
+#   invite = reader.read_until(b"? ")
+
+class SockReader:
+    def __init__(self, sock, size=1 << 16):
+        self.sock = sock
+        self.buf = bytearray(size)
+        self.view = memoryview(self.buf)
+        self.start = 0      # début des données non lues
+        self.end = 0        # fin des données reçues
+        self.eof = False
+        self.recvs = 0
+
+    def _fill(self):
+        # Place libre en fin de tampon : recompactage, ou doublement si le tampon est plein
+        if self.start == self.end:
+            self.start = self.end = 0
+        elif self.end == len(self.buf):
+            n = self.end - self.start
+            if self.start:
+                self.buf[:n] = self.buf[self.start:self.end]
+            else:
+                self.view.release()
+                self.buf.extend(bytes(len(self.buf)))
+                self.view = memoryview(self.buf)
+            self.start, self.end = 0, n
+        n = self.sock.recv_into(self.view[self.end:])
+        self.recvs += 1
+        if n == 0:
+            self.eof = True
+        self.end += n
+
+    def _take(self, j):
+        out = bytes(self.view[self.start:j])
+        self.start = j
+        return out
+
+    def read_until(self, delim=b"\n"):
+        # Jusqu'au délimiteur inclus ; à la fin du flux, ce qui reste (comme l'ancien recv_until)
+        vus = 0     # octets déjà parcourus sans trouver delim
+        while True:
+            i = self.buf.find(delim, self.start + vus, self.end)
+            if i >= 0:
+                return self._take(i + len(delim))
+            if self.eof:
+                return self._take(self.end)
+            vus = max(self.end - self.start - len(delim) + 1, 0)
+            self._fill()
+
+    def readline(self):
+        return self.read_until(b"\n")
+
+    def read_rest(self):
+        # Tout jusqu'à la fermeture (ou au timeout de la socket)
+        try:
+            while not self.eof:
+                self._fill()
+        except TimeoutError:
+            pass
+        return self._take(self.end)
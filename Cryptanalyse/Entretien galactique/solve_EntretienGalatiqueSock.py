@@ -1,91 +1,166 @@
+import argparse
+import math
+import os
 import socket
-from sympy import symbols, Poly, solve
 import sys
+import time
 
-def recv_until(sock, delimiter=b"\n"):
-    data = b""
-    while not data.endswith(delimiter):
-        chunk = sock.recv(1)
-        if not chunk:
-            break
-        data += chunk
-    print(data.decode(errors="ignore"), end="")
+from power_sums import elementary_symmetric
+from sockreader import SockReader
+
+HOST = "challenges.404ctf.fr"
+PORT = 30069
+LIMITE = 5      # secondes accordées par réponse (t2 - t1 côté serveur)
+
+def recv_until(reader, delimiter=b"\n", verbose=True):
+    data = reader.read_until(delimiter)
+    if verbose:
+        print(data.decode(errors="ignore"), end="")
     return data
 
+def cubic_roots(p1, p2, p3):
+    # Racines entières de t^3 - p1 t^2 + p2 t - p3, triées, sans sympy.
+    # Newton entier depuis sqrt(x^2 + y^2 + z^2) >= z : la suite décroît vers z sans le dépasser,
+    # puis la quadratique restante se résout avec isqrt.
+    # Gardée à côté de power_sums.integer_roots (k quelconque, à partir des e_j) : chemin
+    # direct pour k = 3 depuis les e_j déjà calculés, sans boucle de division synthétique.
+    f = lambda t: ((t - p1) * t + p2) * t - p3
+    df = lambda t: (3 * t - 2 * p1) * t + p2
+    t = math.isqrt(max(p1 * p1 - 2 * p2, 0)) + 1
+    while True:
+        v = f(t)
+        if v <= 0:
+            break
+        t -= max(v // df(t), 1)
+    if v != 0:
+        raise ValueError("pas de racine entière")
+    z = t
+    b = p1 - z
+    c = p2 - z * b
+    disc = b * b - 4 * c
+    r = math.isqrt(disc) if disc >= 0 else -1
+    if r < 0 or r * r != disc or (b - r) % 2:
+        raise ValueError("pas de racine entière")
+    return (b - r) // 2, (b + r) // 2, z
+
+def bench_roots(n=10000):
+    # n triplets tirés comme getRand() (EntretienGalactique.py) : cubic_roots contre sympy
+    from sympy import symbols, Poly, solve
+    getRand = lambda: int.from_bytes(os.urandom(16), "big")
+    triplets = [tuple(sorted(getRand() for _ in range(3))) for _ in range(n)]
+    polys = [(x + y + z, x * y + x * z + y * z, x * y * z) for x, y, z in triplets]
+
+    t0 = time.time()
+    for (p1, p2, p3), attendu in zip(polys, triplets):
+        assert cubic_roots(p1, p2, p3) == attendu
+    dt_int = time.time() - t0
+
+    x = symbols('x')
+    t0 = time.time()
+    for (p1, p2, p3), attendu in zip(polys, triplets):
+        assert tuple(sorted(int(r) for r in solve(Poly(x**3 - p1*x**2 + p2*x - p3), x))) == attendu
+    dt_sympy = time.time() - t0
+
+    print(f"[*] cubic_roots : {1e6 * dt_int / n:.1f} µs / triplet")
+    print(f"[*] sympy.solve   : {1e6 * dt_sympy / n:.1f} µs / triplet")
+    print(f"[+] Gain : x{dt_sympy / dt_int:.0f} sur {n} triplets")
+
 def print_progress(current, total, bar_length=40):
     progress = int(bar_length * current / total)
     bar = "[" + "#" * progress + "-" * (bar_length - progress) + "]"
     sys.stdout.write(f"\r{bar} {current}/{total}")
     sys.stdout.flush()
 
-def solve_entretien_rh_socket():
-    host = "challenges.404ctf.fr"
-    port = 30069
+# Sommes lues dans le flux ; la question RH (sans fin de ligne) précède "x + y + z = " du tour suivant
+MARQUEURS = [(b"x + y + z = ", 0), (b"x^2 + y^2 + z^2 = ", 1), (b"x^3 + y^3 + z^3 = ", 2)]
 
+def solve_entretien_rh_socket(host=HOST, port=PORT, verbose=True, save=True):
+    # Machine à états sur le flux de lignes : la réponse part dès que la somme des cubes
+    # est lue, sans attendre la question RH (input() la trouvera dans le tampon du serveur).
+    # Renvoie (texte final, mesures par tour : [(attente réseau, calcul)])
     print(f"Connexion à {host}:{port}")
     s = socket.create_connection((host, port))
-    s.settimeout(5)
+    s.settimeout(LIMITE)
+    reader = SockReader(s)
 
     # Lire toute l’intro d’un coup jusqu’à la question
-    intro = b""
-    while b"Comment vous appelez-vous" not in intro:
-        chunk = s.recv(1024)
-        if not chunk:
-            break
-        intro += chunk
-        print(chunk.decode(errors="ignore"), end="")
+    recv_until(reader, b"Comment vous appelez-vous ? ", verbose)
 
     name = "Galactix"
-    print(f"\n>>> Envoi du prénom : {name}\n")
+    if verbose:
+        print(f"\n>>> Envoi du prénom : {name}\n")
     s.sendall((name + "\n").encode())
 
-    for i in range(1, 101):
-        print_progress(i, 100)
-
-        recv_until(s, b"x + y + z = ")
-        s1 = int(recv_until(s).strip())
-
-        recv_until(s, b"x^2 + y^2 + z^2 = ")
-        s2 = int(recv_until(s).strip())
-
-        recv_until(s, b"x^3 + y^3 + z^3 = ")
-        s3 = int(recv_until(s).strip())
-
-        # Newton
-        p1 = s1
-        p2 = (s1**2 - s2) // 2
-        p3 = (s1**3 - 3*s1*s2 + 2*s3) // 6
-
-        x = symbols('x')
-        poly = Poly(x**3 - p1*x**2 + p2*x - p3)
-        roots = solve(poly, x)
-        roots = sorted(int(r) for r in roots)
-
-        answer = f"{roots[0]},{roots[1]},{roots[2]}"
-        recv_until(s, b"? ")
-        s.sendall(answer.encode() + b"\n")
+    sommes = [None, None, None]
+    mesures = []
+    t0 = time.perf_counter()
+    while len(mesures) < 100:
+        line = recv_until(reader, verbose=verbose)
+        if not line:
+            break   # connexion coupée par le serveur
+        for marqueur, k in MARQUEURS:
+            i = line.rfind(marqueur)
+            if i >= 0:
+                sommes[k] = int(line[i + len(marqueur):].strip())
+                break
+        else:
+            continue
+        if k != 2:
+            continue
+        t1 = time.perf_counter()
+
+        # Newton-Girard (power_sums.py), puis le solveur cubique dédié
+        p1, p2, p3 = elementary_symmetric(sommes)
+        roots = cubic_roots(p1, p2, p3)
+        s.sendall(f"{roots[0]},{roots[1]},{roots[2]}\n".encode())
+        t2 = time.perf_counter()
+        mesures.append((t1 - t0, t2 - t1))
+        t0 = t2
+        if verbose:
+            print_progress(len(mesures), 100)
 
     # Lecture finale
-    print("\n\n>>> Lecture finale (flag)")
-    final = b""
-    try:
-        while True:
-            part = s.recv(4096)
-            if not part:
-                break
-            final += part
-    except socket.timeout:
-        pass
+    if verbose:
+        print(f"\n\n>>> {reader.recvs} appels recv pour {len(mesures)} tours")
+        print(">>> Lecture finale (flag)")
+    final = reader.read_rest()
+    # La dernière question RH n'a pas été consommée : elle précède le message final
+    final = final.partition(b" ? ")[2] or final
 
     decoded = final.decode()
     print(decoded)
 
-    with open("flag.txt", "w") as f:
-        f.write(decoded)
-
-    print("\n✅ Flag enregistré dans flag.txt")
+    if save:
+        with open("flag.txt", "w") as f:
+            f.write(decoded)
+        print("\n✅ Flag enregistré dans flag.txt")
     s.close()
+    return decoded, mesures
+
+def print_timings(mesures, total, rtt=None):
+    attentes = [a for a, _ in mesures]
+    calculs = [c for _, c in mesures]
+    if not mesures:
+        # Connexion coupée avant la fin du premier tour (hôte, port ou réponse incorrects)
+        print(f"[-] Total 0 tours : {total:.2f} s")
+        return
+    print(f"[*] Calcul par tour  : moy {1e3 * sum(calculs) / len(calculs):.3f} ms, max {1e3 * max(calculs):.3f} ms")
+    print(f"[*] Attente réseau   : moy {1e3 * sum(attentes) / len(attentes):.1f} ms, max {1e3 * max(attentes):.1f} ms")
+    print(f"[*] Total {len(mesures)} tours : {total:.2f} s")
+    if rtt is not None:
+        # Côté serveur, t2 - t1 ~ calcul + un aller-retour (invite -> réponse)
+        print(f"[+] Marge sur t2 - t1 < {LIMITE} s : {LIMITE - max(calculs) - rtt:.3f} s")
 
 if __name__ == "__main__":
-    solve_entretien_rh_socket()
+    ap = argparse.ArgumentParser(description="Solveur Entretien galactique")
+    ap.add_argument("--host", default=HOST)
+    ap.add_argument("--port", type=int, default=PORT)
+    ap.add_argument("--bench-roots", type=int, metavar="N", help="cubic_roots contre sympy sur N triplets")
+    args = ap.parse_args()
+    if args.bench_roots:
+        bench_roots(args.bench_roots)
+    else:
+        t0 = time.perf_counter()
+        _, mesures = solve_entretien_rh_socket(args.host, args.port)
+        print_timings(mesures, time.perf_counter() - t0)
 
@@ -1,24 +1,133 @@
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import unpad, pad
 from Crypto.Util.number import long_to_bytes
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 import base64
+import os
+import random
+import sys
+import time
+
+from decrypt2 import curve
+from ecdlp import ecdlp
 
 # === Paramètres ===
-# secret d
-d = 0x268dc922041bc83705b0f8b79a6c8c2ce252a7608271eb4b43b46f3db8e2027b  # <-- données par sagemath
+# point public d·G du serveur netcat
+Q = (39311316229561408016945382012255721276819025652402786701955298003197076419773,
+     47712086530320905176477697257104565833621565835204235488853774905456221103927)
 username = "me"         # <-- le nom du début
 ciphertext = bytes.fromhex("23c21181c74b0b2084ec1232606ba05b59374f309f849de74530800039abcbedf277d05e6c8ef29c871b78c908297107")  # <-- la chaine crtptée du serveur netcat
 
-# === Clé AES et IV ===
-key = pad(long_to_bytes(d), 32)[:32]
-iv  = pad(username.encode(), 16)[:16]
+CHUNK = 20000   # candidats d par tâche du pool
+PREFIX = b"404CTF{"     # début de clair attendu : départage les noms (l'IV ne touche que le 1er bloc)
+
+# === Clé AES et IV, exactement comme encryptData (challenge.py) ===
+def deriveKey(d, username):
+    return pad(long_to_bytes(d), 32)[:32], pad(username.encode(), 16)[:16]
+
+def lastBlockPadded(d, ciphertext, iv=None):
+    # Padding PKCS#7 du dernier bloc seul : un déchiffrement AES d'un bloc.
+    # Avec au moins 2 blocs, le dernier bloc clair ne dépend pas de l'IV (donc du nom).
+    key = pad(long_to_bytes(d), 32)[:32]
+    prev = ciphertext[-32:-16] if len(ciphertext) > 16 else iv
+    last = bytes(a ^ b for a, b in zip(AES.new(key, AES.MODE_ECB).decrypt(ciphertext[-16:]), prev))
+    n = last[-1]
+    return 1 <= n <= 16 and last[-n:] == bytes([n]) * n
+
+def decryptWith(d, username, ciphertext):
+    key, iv = deriveKey(d, username)
+    try:
+        return unpad(AES.new(key, AES.MODE_CBC, iv).decrypt(ciphertext), 16)
+    except ValueError:
+        return None
+
+def plausible(clair, prefix):
+    if prefix is not None:
+        return clair.startswith(prefix)
+    try:
+        return clair.decode().isprintable()
+    except UnicodeDecodeError:
+        return False
+
+def _screen(args):
+    # Worker : tri par le dernier bloc, puis déchiffrement complet pour chaque nom
+    ds, usernames, ciphertext, prefix = args
+    trouves = []
+    un_bloc = len(ciphertext) == 16
+    for d in ds:
+        if not un_bloc and not lastBlockPadded(d, ciphertext):
+            continue
+        for name in usernames:
+            if un_bloc and not lastBlockPadded(d, ciphertext, deriveKey(d, name)[1]):
+                continue
+            clair = decryptWith(d, name, ciphertext)
+            if clair is not None and plausible(clair, prefix):
+                trouves.append((d, name, clair.decode(errors="replace")))
+    return trouves
+
+def testCandidates(candidates, usernames, ciphertext, prefix=PREFIX, workers=None):
+    # Itérateur de d (éventuellement infini) -> flux de (d, nom, clair) plausibles ;
+    # prefix=None : tout clair imprimable est gardé
+    workers = workers or os.cpu_count()
+    candidates = iter(candidates)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        en_vol = []
+        while True:
+            # Au plus 2 paquets par worker en vol : la mémoire reste bornée
+            while len(en_vol) < 2 * workers:
+                paquet = list(islice(candidates, CHUNK))
+                if not paquet:
+                    break
+                en_vol.append(pool.submit(_screen, (paquet, list(usernames), ciphertext, prefix)))
+            if not en_vol:
+                return
+            yield from en_vol.pop(0).result()
+
+def readCandidates(path):
+    # Un d par ligne, décimal ou 0x...
+    with open(path) as f:
+        for ligne in f:
+            ligne = ligne.strip()
+            if ligne:
+                yield int(ligne, 0)
+
+def bench(n=200000):
+    # n candidats aléatoires, le vrai d caché au milieu
+    d = ecdlp(curve, curve.g, Q)
+    def candidats():
+        for i in range(n):
+            yield d if i == n // 2 else random.getrandbits(256)
+    t0 = time.time()
+    trouves = list(testCandidates(candidats(), ["me", "admin", "jedi"], ciphertext))
+    dt = time.time() - t0
+    print(f"[*] {n} candidats en {dt:.2f} s : {60 * n / dt / 1e6:.2f} M candidats / minute")
+    for d, name, clair in trouves:
+        print(f"[+] d = {d:#x}, nom = {name!r} : {clair}")
+
+def main():
+    # secret d : courbe anormale => attaque de Smart (avant : 0x268dc922...e2027b, données par sagemath)
+    d = ecdlp(curve, curve.g, Q)
+    key, iv = deriveKey(d, username)
+
+    # === Déchiffrement ===
+    cipher = AES.new(key, AES.MODE_CBC, iv)
+    plaintext_padded = cipher.decrypt(ciphertext)
 
-# === Déchiffrement ===
-cipher = AES.new(key, AES.MODE_CBC, iv)
-plaintext_padded = cipher.decrypt(ciphertext)
+    try:
+        plaintext = unpad(plaintext_padded, 16)
+        print("[+] Message déchiffré :", plaintext.decode())
+    except ValueError:
+        print("[-] Mauvais padding ou d/IV incorrect")
 
-try:
-    plaintext = unpad(plaintext_padded, 16)
-    print("[+] Message déchiffré :", plaintext.decode())
-except ValueError:
-    print("[-] Mauvais padding ou d/IV incorrect")
\ No newline at end of file
+if __name__ == "__main__":
+    # python3 decrypt.py                                  : d par Smart, puis déchiffrement
+    # python3 decrypt.py candidates <fichier_d> [noms...] : crible de candidats d
+    # python3 decrypt.py bench                            : débit du crible
+    if sys.argv[1:2] == ["candidates"]:
+        for d, name, clair in testCandidates(readCandidates(sys.argv[2]), sys.argv[3:] or [username], ciphertext):
+            print(f"[+] d = {d:#x}, nom = {name!r} : {clair}")
+    elif sys.argv[1:] == ["bench"]:
+        bench()
+    else:
+        main()
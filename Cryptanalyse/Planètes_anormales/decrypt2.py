@@ -5,38 +5,219 @@ from Crypto.Util.Padding import pad
 from Crypto.Util.number import long_to_bytes
 from Crypto.Random import random as rd
 import os
+import time
+
+try:
+    import gmpy2    # optionnel : arithmétique GMP pour Curve
+except ImportError:
+    gmpy2 = None
+
+import challenge
+from point_order import bsgs_order, rho_order
 
 # === Courbe ECC ===
 class Curve:
-    def __init__(self, a, b, p, g):
+    def __init__(self, a, b, p, g, backend=None):
         self.a = a
         self.b = b
         self.p = p
         self.g = g
+        self._base = None   # table de base fixe de g, construite au premier mul_base
+        # Backend arithmétique : "gmpy2" (mpz + invert) s'il est installé, sinon "int".
+        # Les calculs internes se font dans le backend, les points rendus restent des int.
+        if backend is None:
+            backend = "int" if gmpy2 is None else "gmpy2"
+        if backend == "gmpy2" and gmpy2 is None:
+            raise ImportError("backend gmpy2 demandé mais gmpy2 n'est pas installé")
+        self.backend = backend
+        self._gmp = backend == "gmpy2"
+        self._a = gmpy2.mpz(a) if self._gmp else a
+        self._p = gmpy2.mpz(p) if self._gmp else p
 
-    def addPoints(self, P, Q):
-        a, p = self.a, self.p
+    def _inv(self, x):
+        return gmpy2.invert(x, self._p) if self._gmp else pow(x, -1, self._p)
+
+    def _out(self, P):
+        return (int(P[0]), int(P[1])) if self._gmp else P
+
+    def _add(self, P, Q):
+        # addPoints sans conversion de sortie (nombres du backend)
+        a, p = self._a, self._p
         if P == (0, 0): return Q
         if Q == (0, 0): return P
         x1, y1, x2, y2 = P[0], P[1], Q[0], Q[1]
         if x1 == x2 and y1 == (-y2 % p): return (0, 0)
         if x1 == x2 and y1 == y2:
-            m = (3 * x1 ** 2 + a) * pow(2 * y1, -1, p) % p
+            m = (3 * x1 ** 2 + a) * self._inv(2 * y1) % p
         else:
-            m = (y2 - y1) * pow(x2 - x1, -1, p) % p
+            m = (y2 - y1) * self._inv(x2 - x1) % p
         x3 = (m ** 2 - x1 - x2) % p
         y3 = (m * (x1 - x3) - y1) % p
         return x3, y3
 
+    def addPoints(self, P, Q):
+        return self._out(self._add(P, Q))
+
+    def add_many(self, Ps, Qs):
+        # [P_i + Q_i] : une seule inversion pour tout le lot (astuce de Montgomery).
+        # Ps, Qs : listes (ou tableaux indexables) de points affines de même longueur.
+        a, p = self._a, self._p
+        nums, dens = [], []
+        for P, Q in zip(Ps, Qs):
+            x1, y1 = P
+            x2, y2 = Q
+            if P == (0, 0) or Q == (0, 0):
+                nums.append(None); dens.append(1)
+            elif x1 != x2:
+                nums.append(y2 - y1); dens.append(x2 - x1)
+            elif y1 == y2 and y1 != 0:
+                nums.append(3 * x1 * x1 + a); dens.append(2 * y1)
+            else:
+                nums.append(None); dens.append(1)    # P = -Q
+        # Produits préfixes, inversion du produit total, puis déroulé à l'envers
+        prefixes = []
+        acc = 1
+        for den in dens:
+            acc = acc * den % p
+            prefixes.append(acc)
+        inv = self._inv(acc)
+        invs = [0] * len(dens)
+        for i in range(len(dens) - 1, 0, -1):
+            invs[i] = inv * prefixes[i - 1] % p
+            inv = inv * dens[i] % p
+        if dens:
+            invs[0] = inv
+        R = []
+        for P, Q, num, inv in zip(Ps, Qs, nums, invs):
+            if num is None:
+                R.append(Q if P == (0, 0) else P if Q == (0, 0) else (0, 0))
+                continue
+            m = num * inv % p
+            x3 = (m * m - P[0] - Q[0]) % p
+            R.append(self._out((x3, (m * (P[0] - x3) - P[1]) % p)))
+        return R
+
     def pointMultiplication(self, k, P):
         R = (0, 0)
         Q = P
         while k > 0:
             if k & 1:
-                R = self.addPoints(R, Q)
-            Q = self.addPoints(Q, Q)
+                R = self._add(R, Q)
+            Q = self._add(Q, Q)
             k >>= 1
-        return R
+        return self._out(R)
+
+    # === Coordonnées jacobiennes : x = X/Z^2, y = Y/Z^3, une seule inversion à la fin ===
+    def _jacDouble(self, P):
+        X, Y, Z = P
+        p = self._p
+        if Y == 0 or Z == 0:
+            return 1, 1, 0
+        YY = Y * Y % p
+        S = 4 * X * YY % p
+        M = (3 * X * X + self._a * pow(Z, 4, p)) % p
+        X3 = (M * M - 2 * S) % p
+        Y3 = (M * (S - X3) - 8 * YY * YY) % p
+        Z3 = 2 * Y * Z % p
+        return X3, Y3, Z3
+
+    def _jacAddAffine(self, P, Q):
+        # P jacobien + Q affine (addition mixte, Z2 = 1)
+        X1, Y1, Z1 = P
+        p = self._p
+        if Q == (0, 0):
+            return P
+        if Z1 == 0:
+            return Q[0], Q[1], 1
+        ZZ = Z1 * Z1 % p
+        U2 = Q[0] * ZZ % p
+        S2 = Q[1] * ZZ * Z1 % p
+        H = (U2 - X1) % p
+        R = (S2 - Y1) % p
+        if H == 0:
+            return self._jacDouble(P) if R == 0 else (1, 1, 0)
+        HH = H * H % p
+        HHH = H * HH % p
+        V = X1 * HH % p
+        X3 = (R * R - HHH - 2 * V) % p
+        Y3 = (R * (V - X3) - Y1 * HHH) % p
+        Z3 = Z1 * H % p
+        return X3, Y3, Z3
+
+    def _toAffine(self, P):
+        X, Y, Z = P
+        if Z == 0:
+            return 0, 0
+        p = self._p
+        zi = self._inv(Z)
+        zi2 = zi * zi % p
+        return self._out((X * zi2 % p, Y * zi2 * zi % p))
+
+    def mul_fast(self, k, P):
+        # Même résultat que pointMultiplication, sans inversion par opération
+        if k == 0 or P == (0, 0):
+            return 0, 0
+        R = (1, 1, 0)
+        for bit in bin(k)[2:]:
+            R = self._jacDouble(R)
+            if bit == "1":
+                R = self._jacAddAffine(R, P)
+        return self._toAffine(R)
+
+    # === Base fixe (peigne à fenêtres) : table des multiples de g gardée sur l'instance ===
+    def _baseTable(self, w):
+        # table[i][j] = j * 2^(w*i) * g en affine, assez de lignes pour k < 2 * p
+        if self._base is None or self._base[0] != w:
+            rows = []
+            B = self.g
+            for _ in range(-(-(self.p.bit_length() + 1) // w)):
+                row = [(0, 0), B]
+                for _ in range(2, 1 << w):
+                    row.append(self.addPoints(row[-1], B))
+                rows.append(row)
+                B = self.addPoints(row[-1], B)
+            self._base = (w, rows)
+        return self._base[1]
+
+    def mul_base(self, k, w=6):
+        # k * g : une addition mixte par fenêtre de w bits, aucun doublement
+        rows = self._baseTable(w)
+        if k.bit_length() > w * len(rows):
+            return self.mul_fast(k, self.g)
+        R = (1, 1, 0)
+        mask = (1 << w) - 1
+        for row in rows:
+            if k == 0:
+                break
+            if k & mask:
+                R = self._jacAddAffine(R, row[k & mask])
+            k >>= w
+        return self._toAffine(R)
+
+    # === Base variable : fenêtre glissante sur les multiples impairs de P ===
+    def mul_window(self, k, P, w=4):
+        if k == 0 or P == (0, 0):
+            return 0, 0
+        P2 = self.addPoints(P, P)
+        odd = [P]
+        for _ in range(1, 1 << (w - 1)):
+            odd.append(self.addPoints(odd[-1], P2))
+        bits = bin(k)[2:]
+        R = (1, 1, 0)
+        i = 0
+        while i < len(bits):
+            if bits[i] == "0":
+                R = self._jacDouble(R)
+                i += 1
+                continue
+            j = min(i + w, len(bits))
+            while bits[j - 1] == "0":
+                j -= 1
+            for _ in range(j - i):
+                R = self._jacDouble(R)
+            R = self._jacAddAffine(R, odd[int(bits[i:j], 2) >> 1])
+            i = j
+        return self._toAffine(R)
 
 # === Paramètres de la courbe custom ===
 curve =  Curve(0xbb0480e1f010abb2e69e7d72df5d75a23a15bc73710df25b6da04121f904e4f5,
@@ -46,6 +227,9 @@ curve =  Curve(0xbb0480e1f010abb2e69e7d72df5d75a23a15bc73710df25b6da04121f904e4f
                       0x97e570cf7c177584ddd036d9181a3f5f83307f60c92b539a2d4f479d9c9ad4bd)
                      )
 
+# === Courbes standard du challenge : paramètres de challenge.py, moteur Curve de ce fichier ===
+Curves = {name: Curve(c.a, c.b, c.p, c.g) for name, c in challenge.Curves.items()}
+
 # === Point Q = d·G donné ===
 Q_target = (
     79944403612648084410282504217789823912187113913937547911584848200371745063162,
@@ -53,33 +237,98 @@ Q_target = (
 )
 
 def find_order2(curve, G, max_n=2**30):
-    P = G
-    for n in range(1, max_n):
-        if P == (0, 0):
-            return n
-        P = curve.addPoints(P, G)
-    return None  # si ordre > max_n
-
-def find_order(curve, G, max_check=1_000_000):
-    P = G
-    for i in range(1, max_check):
-        P = curve.addPoints(P, G)
-        if P == (0, 0):
-            return i + 1
-    return None
+    # Rho de Pollard (Brent) : mémoire constante, ~sqrt(ord(G)) additions
+    return rho_order(curve, G, max_steps=max_n)
+
+def find_order(curve, G, max_check=2**40):
+    # BSGS : ordre exact s'il est <= max_check, None certifie ord(G) > max_check
+    return bsgs_order(curve, G, max_check)
 
 def order():
     order = find_order(curve, curve.g)
     if order:
         print(f"[+] Ordre du point G : {order}")
     else:
-        print("[-] G a un grand ordre (ou supérieur à max_n)")
+        print("[-] G a un grand ordre (> 2^40, certifié par BSGS)")
 
 def attQ():
     G = curve.g
-    Q1 = curve.pointMultiplication(rd.randint(2, curve.p - 1), G)
-    Q2 = curve.pointMultiplication(rd.randint(2, curve.p - 1), G)
+    Q1 = curve.mul_base(rd.randint(2, curve.p - 1))
+    Q2 = curve.mul_base(rd.randint(2, curve.p - 1))
     print(f"Q1={Q1}\nQ2={Q2}")
     print(Q1 == Q2)  # Si True, alors `d` est fixé !!!
 
-order()
\ No newline at end of file
+def check_mul_fast(n=20):
+    # mul_fast (jacobien) doit redonner exactement pointMultiplication du challenge (affine)
+    for name, c in list(Curves.items()) + [("custom", curve)]:
+        ref = challenge.translate(name)     # nom inconnu : la courbe custom
+        for k in [0, 1, 2, 3] + [rd.randint(2, c.p - 1) for _ in range(n)]:
+            R = ref.pointMultiplication(k, ref.g)
+            assert c.pointMultiplication(k, c.g) == R, (name, k)
+            assert c.mul_fast(k, c.g) == R, (name, k)
+            assert c.mul_base(k) == R, (name, k)
+            assert c.mul_window(k, c.g) == R, (name, k)
+        print(f"[+] {name} : mul_fast == mul_base == mul_window == pointMultiplication == challenge.py")
+
+def bench_mul(n=200):
+    # k * g pour n scalaires aléatoires, sur la courbe custom (256 bits)
+    ks = [rd.randint(2, curve.p - 1) for _ in range(n)]
+    t0 = time.time()
+    curve.mul_base(1)  # précalcul de la table de g
+    print(f"[*] Précalcul base fixe : {time.time() - t0:.3f} s")
+    for nom, f in [("pointMultiplication", lambda k: curve.pointMultiplication(k, curve.g)),
+                   ("mul_fast", lambda k: curve.mul_fast(k, curve.g)),
+                   ("mul_window", lambda k: curve.mul_window(k, curve.g)),
+                   ("mul_base", curve.mul_base)]:
+        t0 = time.time()
+        for k in ks:
+            f(k)
+        dt = time.time() - t0
+        print(f"[*] {nom:20s} : {1e3 * dt / n:.3f} ms / multiplication")
+
+def bench_add_many(n=1000, rounds=20):
+    # n additions indépendantes : addPoints un par un contre add_many
+    for name, c in [("secp160k1", Curves["secp160k1"]), ("custom", curve)]:
+        Ps = [c.mul_base(rd.randint(2, c.p - 1)) for _ in range(n)]
+        Qs = [c.mul_base(rd.randint(2, c.p - 1)) for _ in range(n)]
+        Ps[0], Qs[1], Qs[2] = (0, 0), Ps[1], (Ps[2][0], -Ps[2][1] % c.p)   # cas particuliers
+        assert c.add_many(Ps, Qs) == [c.addPoints(P, Q) for P, Q in zip(Ps, Qs)]
+        t0 = time.time()
+        for _ in range(rounds):
+            [c.addPoints(P, Q) for P, Q in zip(Ps, Qs)]
+        t1 = time.time()
+        for _ in range(rounds):
+            c.add_many(Ps, Qs)
+        t2 = time.time()
+        print(f"[*] {name:10s} : addPoints {1e6 * (t1 - t0) / (n * rounds):.2f} µs, "
+              f"add_many {1e6 * (t2 - t1) / (n * rounds):.2f} µs / addition (x{(t1 - t0) / (t2 - t1):.1f})")
+
+def bench_backend(n=200):
+    # pointMultiplication (affine) par backend, sur secp160k1 et la courbe custom
+    backends = ["int"] + (["gmpy2"] if gmpy2 is not None else [])
+    for name, c in [("secp160k1", Curves["secp160k1"]), ("custom", curve)]:
+        ks = [rd.randint(2, c.p - 1) for _ in range(n)]
+        ref = None
+        for backend in backends:
+            cb = Curve(c.a, c.b, c.p, c.g, backend)
+            t0 = time.time()
+            R = [cb.pointMultiplication(k, cb.g) for k in ks]
+            dt = time.time() - t0
+            assert ref is None or R == ref
+            ref = R
+            print(f"[*] {name:10s} {backend:6s} : {1e3 * dt / n:.3f} ms / pointMultiplication")
+    if gmpy2 is None:
+        print("[-] gmpy2 absent : seul le backend int est mesuré")
+
+if __name__ == "__main__":
+    import sys
+    if sys.argv[1:] == ["check"]:
+        check_mul_fast()
+    elif sys.argv[1:] == ["bench"]:
+        bench_mul()
+    elif sys.argv[1:] == ["bench_add"]:
+        bench_add_many()
+    elif sys.argv[1:] == ["bench_backend"]:
+        bench_backend()
+    else:
+        order()
\ No newline at end of file
@@ -0,0 +1,150 @@
+# Logarithme discret sur Curve : Pohlig-Hellman + BSGS + CRT, sans Sage
+#
+# ecdlp(curve, G, Q) renvoie d tel que d*G == Q :
+#   1. ordre de G (donné, lu dans le cache, ou calculé par point_order),
+#   2. factorisation de l'ordre (division d'essai + rho de Pollard), mémorisée
+#      sur disque dans ecdlp_cache.json, clé = paramètres de la courbe et de G,
+#   3. un BSGS par chiffre q-adique dans chaque sous-groupe d'ordre q^e,
+#   4. recombinaison par restes chinois.
+#
+# Le coût est dominé par sqrt(plus grand facteur premier de l'ordre) : au-delà de
+# BSGS_LIMIT, ecdlp lève une ValueError plutôt que de tourner indéfiniment.
+# Exception : un sous-groupe d'ordre p (courbe anormale) passe par l'attaque de Smart.
+#
+# Exemple :
+#   python3 ecdlp.py --bits 48      # courbe jouet aléatoire, d aléatoire retrouvé
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+
+from point_order import O, factor, bsgs_order, rho_order_parallel
+from point import Point
+from smart import is_anomalous, smart_attack
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CACHE = os.path.join(HERE, "ecdlp_cache.json")
+BSGS_LIMIT = 1 << 48    # plus grand sous-groupe premier traité par BSGS
+
+
+# === Cache disque des ordres factorisés ===
+def curve_key(curve, G):
+    return ":".join(f"{v:x}" for v in (curve.a, curve.b, curve.p, G[0], G[1]))
+
+def load_cache(path=CACHE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache, path=CACHE):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(cache, f, indent=1)
+    os.replace(tmp, path)
+
+def factored_order(curve, G, order=None, path=CACHE):
+    # (ordre, {q: e}) de G ; calculé une seule fois par courbe
+    cache = load_cache(path)
+    key = curve_key(curve, G)
+    if key in cache and (order is None or int(cache[key]["order"]) == order):
+        entry = cache[key]
+        return int(entry["order"]), {int(q): e for q, e in entry["factors"].items()}
+    if order is None:
+        hasse = curve.p + 1 + 2 * math.isqrt(curve.p) + 2
+        order = bsgs_order(curve, G, hasse) if curve.p < 1 << 36 else rho_order_parallel(curve, G)
+    facteurs = factor(order)
+    cache[key] = {"order": str(order), "factors": {str(q): e for q, e in facteurs.items()}}
+    save_cache(cache, path)
+    return order, facteurs
+
+
+# === Briques de groupe ===
+def neg(curve, P):
+    return O if P == O else (P[0], -P[1] % curve.p)
+
+def sub(curve, P, Q):
+    return curve.addPoints(P, neg(curve, Q))
+
+def bsgs_log(curve, G, Q, n):
+    # x dans [0, n) tel que x*G == Q, G d'ordre n ; table indexée par Point.key (un int par entrée)
+    m = math.isqrt(n - 1) + 1
+    baby = {}
+    P = O
+    for j in range(m):
+        baby.setdefault(Point.from_tuple(P).key, j)
+        P = curve.addPoints(P, G)
+    pas = neg(curve, curve.mul_fast(m, G))
+    R = Q
+    for i in range(m):
+        j = baby.get(Point.from_tuple(R).key)
+        if j is not None:
+            return (i * m + j) % n
+        R = curve.addPoints(R, pas)
+    raise ValueError("Q n'est pas dans le sous-groupe engendré par G")
+
+def crt(residus, modules):
+    x, M = 0, 1
+    for r, m in zip(residus, modules):
+        t = (r - x) * pow(M, -1, m) % m
+        x += M * t
+        M *= m
+    return x % M
+
+
+# === Pohlig-Hellman ===
+def prime_power_log(curve, G, Q, q, e):
+    # G d'ordre q^e : d = d_0 + d_1 q + ... chiffre par chiffre dans le sous-groupe d'ordre q
+    gamma = curve.mul_fast(q ** (e - 1), G)
+    x = 0
+    for k in range(e):
+        H = curve.mul_fast(q ** (e - 1 - k), sub(curve, Q, curve.mul_fast(x, G)))
+        x += bsgs_log(curve, gamma, H, q) * q ** k
+    return x
+
+def ecdlp(curve, G, Q, order=None, path=CACHE):
+    if order is None and is_anomalous(curve, G):
+        return smart_attack(curve, G, Q)
+    n, facteurs = factored_order(curve, G, order, path)
+    trop_grand = [q for q in facteurs if q > BSGS_LIMIT and q != curve.p]
+    if trop_grand:
+        raise ValueError(f"sous-groupe d'ordre premier {max(trop_grand):#x} hors de portée de BSGS")
+    residus, modules = [], []
+    for q, e in facteurs.items():
+        h = n // q ** e
+        Gq, Qq = curve.mul_fast(h, G), curve.mul_fast(h, Q)
+        if q == curve.p and e == 1:
+            residus.append(smart_attack(curve, Gq, Qq))
+        else:
+            residus.append(prime_power_log(curve, Gq, Qq, q, e))
+        modules.append(q ** e)
+    d = crt(residus, modules)
+    assert curve.mul_fast(d, G) == Q
+    return d
+
+
+def main():
+    from point_order import random_curve
+    ap = argparse.ArgumentParser(description="Pohlig-Hellman sur une courbe jouet")
+    ap.add_argument("--bits", type=int, default=40, help="taille du p de la courbe jouet")
+    args = ap.parse_args()
+
+    c = random_curve(args.bits)
+    print(f"[*] Courbe jouet : p = {c.p} ({args.bits} bits), G = {c.g}")
+    t0 = time.time()
+    n, facteurs = factored_order(c, c.g)
+    print(f"[+] ord(G) = {n} = {' * '.join(f'{q}^{e}' if e > 1 else str(q) for q, e in sorted(facteurs.items()))}"
+          f"  ({time.time() - t0:.2f} s)")
+    d = random.randrange(1, n)
+    Q = c.mul_fast(d, c.g)
+    t0 = time.time()
+    trouve = ecdlp(c, c.g, Q)
+    print(f"[+] d = {trouve} ({'OK' if trouve == d else 'FAUX'})  ({time.time() - t0:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
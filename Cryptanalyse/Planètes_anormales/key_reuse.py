@@ -0,0 +1,89 @@
+# Détection de réutilisation de clé : generateKey (challenge.py) rejoué en parallèle
+#
+# attQ() de decrypt2.py compare deux tirages ; ici on rejoue generateKey sur N jetons
+# échantillonnés (les trois destinations + le jeton injecté qui mène à la courbe custom),
+# sur un pool de processus. Les points publics arrivent en flux dans un ensemble de
+# clés compressées (point.py) : une collision = un d tiré deux fois sur la même courbe.
+#
+# --rng crypto : Crypto.Random.random, comme le serveur (aucune collision attendue)
+# --rng weak   : serveur patché, reseedé à chaque connexion par random.Random(graine)
+#                avec une graine de SEED_BITS bits (horodatage tronqué par ex.) : les d se
+#                répètent quel que soit le nombre de workers (vérifie que le harnais les voit)
+#
+# Exemple :
+#   python3 key_reuse.py -n 20000 --workers 4
+#   python3 key_reuse.py -n 20000 --workers 4 --rng weak
+
+import argparse
+import ast
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import challenge
+from point import Point
+
+CHUNK = 250
+SEED_BITS = 12      # espace de graines du serveur faible
+INJECTION = "x','curve':'custom"     # le second 'curve' écrase le premier dans literal_eval
+
+
+def sampleTokens(n, seed=0):
+    rnd = random.Random(seed)
+    jetons = []
+    for _ in range(n):
+        name = INJECTION if rnd.random() < 0.25 else os.urandom(4).hex()
+        jetons.append(ast.literal_eval(challenge.createToken(name, rnd.randint(1, 3))))
+    return jetons
+
+_weak = None        # générateur des graines par connexion, si --rng weak
+
+def _initWorker(rng, seed):
+    global _weak
+    if rng == "weak":
+        # Graines propres à chaque worker : seul le petit espace de graines fait collisionner
+        _weak = random.Random(f"{seed}-{os.getpid()}")
+
+def _keyFor(token):
+    if _weak is not None:
+        challenge.rd = random.Random(_weak.getrandbits(SEED_BITS))
+    return Point.from_tuple(challenge.generateKey(token)[0]).key
+
+def _replay(jetons):
+    # (courbe, clé compressée du point public) pour chaque jeton
+    return [(token["curve"], _keyFor(token)) for token in jetons]
+
+def run(n, workers, rng="crypto", seed=1337):
+    jetons = sampleTokens(n)
+    paquets = [jetons[i:i + CHUNK] for i in range(0, n, CHUNK)]
+    vus = set()
+    collisions = []
+    t0 = time.time()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_initWorker, initargs=(rng, seed)) as pool:
+        for resultats in pool.map(_replay, paquets):
+            for entree in resultats:
+                if entree in vus:
+                    collisions.append(entree)
+                vus.add(entree)
+    dt = time.time() - t0
+    return collisions, dt
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Réutilisation de d dans generateKey")
+    ap.add_argument("-n", type=int, default=10000, help="nombre de jetons rejoués")
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    ap.add_argument("--rng", choices=["crypto", "weak"], default="crypto")
+    args = ap.parse_args()
+
+    collisions, dt = run(args.n, args.workers, args.rng)
+    print(f"[*] {args.n} generateKey en {dt:.2f} s sur {args.workers} workers : {args.n / dt:.0f} multiplications scalaires / s")
+    if collisions:
+        print(f"[+] {len(collisions)} collisions, par ex. {collisions[0][0]} : clé {collisions[0][1]:#x}")
+    else:
+        print("[-] Aucune collision : d n'est jamais réutilisé")
+
+
+if __name__ == "__main__":
+    main()
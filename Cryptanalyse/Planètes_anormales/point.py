@@ -0,0 +1,186 @@
+# Point affine compact : __slots__, immuable, infini dédié, hachage par encodage compressé
+#
+# Curve manipule des tuples (x, y) avec (0, 0) pour l'infini, ce qui est ambigu :
+# (0, 0) est un vrai point affine de toute courbe avec b = 0.
+# Point sert de frontière propre : Point.from_tuple / to_tuple convertissent la
+# convention de Curve, INFINITY est un singleton distinct de tout point affine.
+#
+# - key : entier compressé x*2 + parité(y), calculé une fois ; c'est lui qu'on stocke
+#   dans les tables BSGS (un int au lieu d'un tuple de deux ints)
+# - to_bytes / from_bytes : encodage SEC1, 33 octets compressé ou 65 octets brut
+#   pour une courbe 256 bits, 0x00 pour l'infini
+# - save_table / load_table : tables de points à taille d'enregistrement fixe sur disque,
+#   load_keys relit directement les clés (pas de racine carrée modulaire)
+#
+# Exemple :
+#   python3 point.py            # mémoire d'une table de 200 000 points, aller-retour disque
+
+import os
+import time
+
+
+class Point:
+    __slots__ = ("x", "y", "_key")
+
+    def __init__(self, x, y):
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+        object.__setattr__(self, "_key", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Point est immuable")
+
+    def __reduce__(self):
+        # pickle / copy : reconstruction par le constructeur (pools de processus de rho),
+        # l'infini redevient le singleton
+        return (_infinity, ()) if self.x is None else (Point, (self.x, self.y))
+
+    @property
+    def key(self):
+        if self._key is None:
+            object.__setattr__(self, "_key", -1 if self.x is None else self.x << 1 | self.y & 1)
+        return self._key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return isinstance(other, Point) and self.x == other.x and self.y == other.y
+
+    def __iter__(self):
+        return iter((self.x, self.y))
+
+    def __repr__(self):
+        return "Point(INFINITY)" if self.x is None else f"Point({self.x:#x}, {self.y:#x})"
+
+    def is_infinity(self):
+        return self.x is None
+
+    # === Convention (0, 0) de Curve ===
+    @classmethod
+    def from_tuple(cls, P):
+        return INFINITY if P == (0, 0) else cls(P[0], P[1])
+
+    def to_tuple(self):
+        return (0, 0) if self.x is None else (self.x, self.y)
+
+    # === SEC1 ===
+    def to_bytes(self, size, compressed=True):
+        if self.x is None:
+            return b"\x00"
+        if compressed:
+            return bytes([2 | self.y & 1]) + self.x.to_bytes(size, "big")
+        return b"\x04" + self.x.to_bytes(size, "big") + self.y.to_bytes(size, "big")
+
+    @classmethod
+    def from_bytes(cls, data, curve):
+        size = field_size(curve)
+        if data == b"\x00":
+            return INFINITY
+        x = int.from_bytes(data[1:size + 1], "big")
+        if data[0] == 4:
+            return cls(x, int.from_bytes(data[size + 1:], "big"))
+        y = sqrt_mod((x ** 3 + curve.a * x + curve.b) % curve.p, curve.p)
+        if y is None:
+            raise ValueError("x hors de la courbe")
+        return cls(x, y if y & 1 == data[0] & 1 else curve.p - y)
+
+    @classmethod
+    def from_key(cls, key, curve):
+        return INFINITY if key == -1 else cls.from_bytes(bytes([2 | key & 1]) + (key >> 1).to_bytes(field_size(curve), "big"), curve)
+
+
+INFINITY = Point(None, None)
+
+def _infinity():
+    return INFINITY
+
+
+def field_size(curve):
+    return (curve.p.bit_length() + 7) // 8
+
+def sqrt_mod(a, p):
+    # Tonelli-Shanks ; None si a n'est pas un carré
+    if a == 0:
+        return 0
+    if pow(a, (p - 1) // 2, p) != 1:
+        return None
+    if p % 4 == 3:
+        return pow(a, (p + 1) // 4, p)
+    q, s = p - 1, 0
+    while q % 2 == 0:
+        q //= 2
+        s += 1
+    z = 2
+    while pow(z, (p - 1) // 2, p) != p - 1:
+        z += 1
+    m, c, t, r = s, pow(z, q, p), pow(a, q, p), pow(a, (q + 1) // 2, p)
+    while t != 1:
+        i, t2 = 0, t
+        while t2 != 1:
+            t2 = t2 * t2 % p
+            i += 1
+        b = pow(c, 1 << (m - i - 1), p)
+        m, c, t, r = i, b * b % p, t * b * b % p, r * b % p
+    return r
+
+
+# === Tables sur disque : enregistrements de taille fixe ===
+def save_table(path, points, curve, compressed=True):
+    size = field_size(curve)
+    vide = b"\x00" * (size + 1 if compressed else 2 * size + 1)
+    with open(path, "wb") as f:
+        for P in points:
+            f.write(vide if P.is_infinity() else P.to_bytes(size, compressed))
+
+def load_table(path, curve, compressed=True):
+    size = field_size(curve)
+    n = size + 1 if compressed else 2 * size + 1
+    with open(path, "rb") as f:
+        data = f.read()
+    return [INFINITY if data[i] == 0 else Point.from_bytes(data[i:i + n], curve)
+            for i in range(0, len(data), n)]
+
+def load_keys(path, curve):
+    # Clés compressées d'une table compressée, sans racine carrée (suffit pour BSGS)
+    n = field_size(curve) + 1
+    with open(path, "rb") as f:
+        data = f.read()
+    return [-1 if data[i] == 0 else int.from_bytes(data[i + 1:i + n], "big") << 1 | data[i] & 1
+            for i in range(0, len(data), n)]
+
+
+def bench(n=200_000):
+    from decrypt2 import curve
+    pts = []
+    P = curve.g
+    for _ in range(n):
+        pts.append(P)
+        P = curve.addPoints(P, curve.g)
+
+    # Taille réelle : dictionnaire + objets clés (un tuple possède ses deux ints)
+    table = {P: j for j, P in enumerate(pts)}
+    taille = table.__sizeof__() + sum(P.__sizeof__() + P[0].__sizeof__() + P[1].__sizeof__() for P in table)
+    print(f"[*] Table BSGS de {n} points, clé tuple (x, y) : {taille / n:.0f} octets / entrée")
+    table = {Point.from_tuple(P).key: j for j, P in enumerate(pts)}
+    taille = table.__sizeof__() + sum(k.__sizeof__() for k in table)
+    print(f"[*] Table BSGS de {n} points, clé Point.key    : {taille / n:.0f} octets / entrée")
+    del table
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bsgs_table.bin")
+    objets = [Point.from_tuple(P) for P in pts[:10_000]]
+    for compressed in (True, False):
+        t0 = time.time()
+        save_table(path, objets, curve, compressed)
+        taille = os.path.getsize(path)
+        relu = load_table(path, curve, compressed)
+        assert relu == objets
+        if compressed:
+            assert load_keys(path, curve) == [P.key for P in objets]
+        print(f"[+] Disque {'compressé' if compressed else 'brut     '} : {taille // len(objets)} octets / point, "
+              f"aller-retour {time.time() - t0:.2f} s")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    bench()
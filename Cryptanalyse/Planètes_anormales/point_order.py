@@ -0,0 +1,236 @@
+# Ordre d'un point de courbe : pas de bébé / pas de géant et rho de Pollard
+#
+# - bsgs_order(curve, G, bound) : ordre exact s'il est <= bound, sinon None,
+#   ce qui certifie ord(G) > bound. ~2*sqrt(bound) opérations, sqrt(bound) en mémoire.
+# - rho_order(curve, G)          : rho de Pollard (cycle de Brent), mémoire constante.
+# - rho_order_parallel(...)      : rho à points distingués sur un pool de processus.
+#
+# Les fonctions prennent un objet Curve de decrypt2.py (ou tout objet qui fournit
+# addPoints, mul_fast et la convention (0, 0) pour le point à l'infini).
+#
+# Exemple :
+#   python3 point_order.py --bits 48            # courbe jouet, BSGS et rho comparés
+#   python3 point_order.py --bits 56 --workers 8
+
+import argparse
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+O = (0, 0)      # point à l'infini
+PARTS = 32      # partitions de la marche de rho
+
+
+# === Entiers : Miller-Rabin, rho de Pollard (Brent), factorisation ===
+def is_probable_prime(n, rounds=32):
+    if n < 2:
+        return False
+    for q in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+        if n % q == 0:
+            return n == q
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    bases = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
+    if n >= 3317044064679887385961981:
+        bases += [random.randrange(2, n - 1) for _ in range(rounds)]
+    for a in bases:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def pollard_rho_int(n):
+    # Un facteur non trivial de n composé
+    if n % 2 == 0:
+        return 2
+    while True:
+        y, c, m = random.randrange(1, n), random.randrange(1, n), 128
+        g, r, q = 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+def factor(n, trial=1 << 16):
+    # {premier: exposant} ; division d'essai puis rho de Pollard
+    facteurs = {}
+    for q in [2] + list(range(3, trial, 2)):
+        if q * q > n:
+            break
+        while n % q == 0:
+            facteurs[q] = facteurs.get(q, 0) + 1
+            n //= q
+    pile = [n] if n > 1 else []
+    while pile:
+        m = pile.pop()
+        if is_probable_prime(m):
+            facteurs[m] = facteurs.get(m, 0) + 1
+        else:
+            d = pollard_rho_int(m)
+            pile += [d, m // d]
+    return facteurs
+
+def reduce_order(curve, G, M):
+    # Plus petit diviseur n de M tel que n*G = O, M étant un multiple de l'ordre
+    for q in factor(M):
+        while M % q == 0 and curve.mul_fast(M // q, G) == O:
+            M //= q
+    return M
+
+
+# === Pas de bébé / pas de géant ===
+def bsgs_order(curve, G, bound):
+    if G == O:
+        return 1
+    s = math.isqrt(bound) + 1
+    # Pas de bébé : x(j*G) -> plus petit j (x identifie j*G et -j*G)
+    baby = {}
+    P = G
+    for j in range(1, s + 1):
+        if P == O:
+            return j
+        baby.setdefault(P[0], j)
+        P = curve.addPoints(P, G)
+    # Pas de géant : R = i*s*G ; le premier i qui tombe donne l'ordre minimal
+    S = curve.mul_fast(s, G)
+    R = S
+    for i in range(1, s + 1):
+        if R == O:
+            return i * s
+        j = baby.get(R[0])
+        if j is not None:
+            for n in (i * s - j, i * s + j):
+                if n > 0 and curve.mul_fast(n, G) == O:
+                    return n
+        R = curve.addPoints(R, S)
+    return None
+
+
+# === Rho de Pollard : collision a1*G == a2*G => (a2 - a1) multiple de l'ordre ===
+def _walk(curve, G, seed):
+    # Marche additive X -> X + M[x mod PARTS], la même pour tous les marcheurs d'une seed
+    rnd = random.Random(seed)
+    ms = [rnd.randrange(1, 1 << 32) for _ in range(PARTS)]
+    return ms, [curve.mul_fast(m, G) for m in ms]
+
+def rho_order(curve, G, max_steps=1 << 40, seed=None):
+    # Cycle de Brent sur un seul marcheur
+    ms, Ms = _walk(curve, G, seed)
+    a = random.randrange(1, 1 << 64)
+    X = curve.mul_fast(a, G)
+    tortue, tortue_a = X, a
+    puissance = lam = 1
+    for _ in range(max_steps):
+        if puissance == lam:
+            tortue, tortue_a = X, a
+            puissance *= 2
+            lam = 0
+        h = X[0] % PARTS
+        X = curve.addPoints(X, Ms[h])
+        a += ms[h]
+        lam += 1
+        if X == tortue:
+            return reduce_order(curve, G, a - tortue_a)
+    return None
+
+def _rhoWorker(args):
+    # Marche depuis des départs aléatoires jusqu'à n_dp points distingués
+    curve, G, seed, dp_bits, n_dp = args
+    ms, Ms = _walk(curve, G, seed)
+    mask = (1 << dp_bits) - 1
+    trouves = []
+    while len(trouves) < n_dp:
+        a = random.randrange(1, 1 << 64)
+        X = curve.mul_fast(a, G)
+        for _ in range(20 << dp_bits):
+            if X[0] & mask == 0:
+                trouves.append((X, a))
+                break
+            h = X[0] % PARTS
+            X = curve.addPoints(X, Ms[h])
+            a += ms[h]
+    return trouves
+
+def rho_order_parallel(curve, G, workers=4, dp_bits=None, n_dp=64, max_rounds=1 << 20):
+    # ~sqrt(p) pas attendus : avec dp_bits = log2(p)/4, ~p^(1/4) points distingués à stocker
+    if dp_bits is None:
+        dp_bits = max(4, curve.p.bit_length() // 4)
+    seed = random.randrange(1 << 32)
+    vus = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for _ in range(max_rounds):
+            taches = [(curve, G, seed, dp_bits, n_dp)] * workers
+            for trouves in pool.map(_rhoWorker, taches):
+                for X, a in trouves:
+                    b = vus.setdefault(X, a)
+                    if b != a:
+                        return reduce_order(curve, G, abs(a - b))
+    return None
+
+
+# === Démo : courbe jouet aléatoire ===
+def random_curve(bits):
+    from decrypt2 import Curve
+    while True:
+        p = random.getrandbits(bits) | (1 << (bits - 1)) | 3   # p = 3 mod 4 : racine simple
+        if not is_probable_prime(p):
+            continue
+        a, b = random.randrange(p), random.randrange(p)
+        if (4 * a ** 3 + 27 * b ** 2) % p == 0:
+            continue
+        while True:
+            x = random.randrange(p)
+            rhs = (x ** 3 + a * x + b) % p
+            y = pow(rhs, (p + 1) // 4, p)
+            if y * y % p == rhs and y != 0:
+                return Curve(a, b, p, (x, y))
+
+def main():
+    ap = argparse.ArgumentParser(description="Ordre d'un point : BSGS et rho de Pollard")
+    ap.add_argument("--bits", type=int, default=40, help="taille du p de la courbe jouet")
+    ap.add_argument("--workers", type=int, default=4)
+    args = ap.parse_args()
+
+    c = random_curve(args.bits)
+    print(f"[*] Courbe jouet : p = {c.p} ({args.bits} bits), G = {c.g}")
+    hasse = c.p + 1 + 2 * math.isqrt(c.p) + 2
+    for nom, f in [("BSGS", lambda: bsgs_order(c, c.g, hasse)),
+                   ("rho (Brent)", lambda: rho_order(c, c.g)),
+                   ("rho parallèle", lambda: rho_order_parallel(c, c.g, args.workers))]:
+        t0 = time.time()
+        n = f()
+        print(f"[+] {nom:14s} : ord(G) = {n}  ({time.time() - t0:.2f} s)")
+
+    from decrypt2 import curve
+    t0 = time.time()
+    n = bsgs_order(curve, curve.g, 1 << 32)
+    print(f"[+] Courbe custom : ord(G) {'= ' + str(n) if n else '> 2^32 (certifié)'}  ({time.time() - t0:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Attaque de Smart : log discret en O(log p) sur une courbe anormale (#E = p)
+#
+# On relève G et Q sur une courbe de Q_p (coefficients a, b relevés au hasard modulo
+# p^2, y relevé par Hensel), puis p*G et p*Q tombent dans le noyau de la réduction,
+# où le logarithme formel phi = -x/y est un morphisme vers pZ_p :
+#     d = phi(p*Q) / phi(p*G)  mod p
+# Toute l'arithmétique se fait modulo p^2 avec la classe Curve existante : (p-1)*P
+# reste hors du noyau (inversions licites), seule la dernière addition est spéciale.
+#
+# Exemple :
+#   python3 smart.py            # d de Q_target, comparé à la route générique
+
+import random
+import time
+
+from point_order import O
+
+
+def is_anomalous(curve, G=None):
+    # p*G == O (multiplication jacobienne) : ord(G) = p, donc #E = p par Hasse
+    G = curve.g if G is None else G
+    return G != O and curve.mul_fast(curve.p, G) == O
+
+def _liftPoint(P, a2, b2, p):
+    # y' = y + t*p avec y'^2 = x^3 + a2*x + b2 mod p^2
+    x, y = P
+    t = (x ** 3 + a2 * x + b2 - y * y) // p % p * pow(2 * y, -1, p) % p
+    return x, y + t * p
+
+def _formalLog(lifted, P, p):
+    # phi(p*P)/p mod p, avec A = (p-1)*P calculé modulo p^2 :
+    # A + P en jacobien donne H = p*h, Z3 = H, X3 = R^2, Y3 = -R^3 (mod p^2), d'où phi/p = h/R
+    x1, y1 = lifted.mul_fast(p - 1, P)
+    x2, y2 = P
+    h = (x2 - x1) % (p * p) // p
+    R = (y2 - y1) % p
+    return h * pow(R, -1, p) % p
+
+def smart_attack(curve, G, Q, tries=8):
+    p = curve.p
+    from decrypt2 import Curve
+    for _ in range(tries):
+        # Relevé aléatoire : le relevé canonique donnerait phi(p*G) = 0
+        a2 = curve.a + p * random.randrange(1, p)
+        b2 = curve.b + p * random.randrange(1, p)
+        G2, Q2 = _liftPoint(G, a2, b2, p), _liftPoint(Q, a2, b2, p)
+        lifted = Curve(a2, b2, p * p, G2)
+        uG = _formalLog(lifted, G2, p)
+        if uG == 0:
+            continue
+        d = _formalLog(lifted, Q2, p) * pow(uG, -1, p) % p
+        if curve.mul_fast(d, G) == Q:
+            return d
+    raise ValueError("attaque de Smart en échec (G d'ordre p ?)")
+
+
+def bench():
+    from decrypt2 import curve, Q_target
+    from ecdlp import BSGS_LIMIT
+    t0 = time.time()
+    print(f"[*] Courbe custom anormale : {is_anomalous(curve)}  ({1e3 * (time.time() - t0):.2f} ms)")
+    t0 = time.time()
+    d = smart_attack(curve, curve.g, Q_target)
+    dt_smart = time.time() - t0
+    print(f"[+] Smart : d = {d:#x}  ({1e3 * dt_smart:.2f} ms)")
+
+    # Route générique : Pohlig-Hellman n'a qu'un sous-groupe, d'ordre p ; BSGS y coûte ~2*sqrt(p) additions
+    n = 20000
+    P = curve.g
+    t0 = time.time()
+    for _ in range(n):
+        P = curve.addPoints(P, curve.g)
+    dt_add = (time.time() - t0) / n
+    ops = 2 * 2 ** (curve.p.bit_length() / 2)
+    print(f"[*] Pohlig-Hellman : ord(G) = p premier > BSGS_LIMIT = 2^{BSGS_LIMIT.bit_length() - 1}")
+    print(f"[*] BSGS sur p : ~{ops:.2e} additions à {1e6 * dt_add:.1f} µs = ~{ops * dt_add / 3.15e7:.2e} ans")
+    print(f"[+] Gain Smart : x{ops * dt_add / dt_smart:.2e}")
+
+
+if __name__ == "__main__":
+    bench()
@@ -26,6 +26,7 @@ class Saturn:
         ]
         self.perm = [6, 0, 4, 5, 15, 1, 14, 11, 2, 12, 9, 13, 8, 10, 7, 3]
         self.N = 1337
+        self.buildFused()
 
     def AddKey(self, state):
         return bytes([x ^ y for x, y in zip(state, self.key)])
@@ -45,6 +46,24 @@ class Saturn:
             state = self.Permute(state)
         return state
 
+    # === Moteur rapide : tables fusionnées (AddKey + SubBytes + Permute) ===
+    def buildFused(self):
+        # La sortie i d'un tour vaut S[state[perm[i]] ^ key[perm[i]]] :
+        # une table de 256 octets par position, déjà indexée par la permutation
+        self.fused = [(i, self.perm[i], bytes(self.S[x ^ self.key[self.perm[i]]] for x in range(256)))
+                      for i in range(16)]
+
+    def EncryptFast(self, x):
+        # Deux tampons alternés : aucune allocation pendant les 1337 tours
+        cur = bytearray(x[:16])
+        nxt = bytearray(16)
+        fused = self.fused
+        for _ in range(self.N):
+            for i, j, T in fused:
+                nxt[i] = T[cur[j]]
+            cur, nxt = nxt, cur
+        return bytes(cur)
+
 if __name__ == "__main__":
     nb_enc = 300
     key = os.urandom(16)
@@ -60,11 +79,11 @@ if __name__ == "__main__":
                 block = bytes.fromhex(input("Donne moi un bloc en hexadécimal à chiffrer > "))
                 assert len(block) == 16
 
-                print("Et voilà le chiffré >", S.Encrypt(block).hex())
+                print("Et voilà le chiffré >", S.EncryptFast(block).hex())
             elif command == 2:
                 padded_flag = pad(FLAG, 16)
                 flag_blocks = [padded_flag[i:i+16] for i in range(0, len(padded_flag), 16)]
-                enc_blocks = list(map(S.Encrypt, flag_blocks))
+                enc_blocks = list(map(S.EncryptFast, flag_blocks))
 
                 print("Bon courage... >", b"".join(enc_blocks).hex())
             else:
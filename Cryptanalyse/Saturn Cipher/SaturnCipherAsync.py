@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# SaturnCipherAsync.py — client asyncio pour l'oracle Saturn (sans pwntools)
+#
+# - encrypt(block) est une coroutine ; les requêtes sont pipelinées avec une
+#   fenêtre bornée de requêtes en vol (asyncio.Semaphore).
+# - Les réponses sont découpées dans un tampon incrémental (lectures de 64 Kio),
+#   puis associées dans l'ordre FIFO aux requêtes en attente.
+# - Toutes les sessions (une par bloc du flag) partagent une seule boucle d'événements.
+#
+# Exemple :
+#   python3 SaturnCipherAsync.py              # serveur distant
+#   python3 SaturnCipherAsync.py --local      # SaturnCipher.py en sous-processus (stdin/stdout)
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+
+from SaturnCipherScheduler import BUDGET, BATCH, BlockRecovery
+
+HOST = "challenges.404ctf.fr"
+PORT = 30169
+HERE = os.path.dirname(os.path.abspath(__file__))
+WINDOW = 64     # requêtes en vol au maximum par session
+
+
+class SaturnClient:
+    def __init__(self, reader, writer, window=WINDOW, proc=None):
+        self.reader = reader
+        self.writer = writer
+        self.proc = proc
+        self.buffer = bytearray()
+        self.pending = deque()
+        self.window = asyncio.Semaphore(window)
+        self.budget = BUDGET
+        self.queries = 0
+        self.task = asyncio.create_task(self._readLoop())
+
+    @classmethod
+    async def tcp(cls, host=HOST, port=PORT, window=WINDOW):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, window)
+
+    @classmethod
+    async def local(cls, window=WINDOW):
+        # SaturnCipher.py piloté par stdin/stdout, pour les essais hors ligne
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, "-u", "SaturnCipher.py", cwd=HERE,
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE)
+        return cls(proc.stdout, proc.stdin, window, proc)
+
+    # === Lecture : tampon incrémental, une réponse par ligne complète ===
+    async def _readLoop(self):
+        try:
+            while True:
+                data = await self.reader.read(65536)
+                if not data:
+                    break
+                self.buffer += data
+                n = self.buffer.find(b"\n")
+                while n >= 0:
+                    self._onLine(bytes(self.buffer[:n]))
+                    del self.buffer[:n + 1]
+                    n = self.buffer.find(b"\n")
+        finally:
+            while self.pending:
+                fut = self.pending.popleft()
+                if not fut.done():
+                    fut.set_exception(EOFError("connexion fermée"))
+
+    def _onLine(self, line):
+        # Les invites n'ont pas de fin de ligne : elles précèdent la réponse sur la même ligne
+        if b"> " not in line:
+            return
+        valeur = line.rsplit(b"> ", 1)[1].strip().decode()
+        if self.pending:
+            self.window.release()
+            fut = self.pending.popleft()
+            if not fut.done():
+                fut.set_result(valeur)
+
+    async def _request(self, payload):
+        if self.budget < 1:
+            raise EOFError("budget épuisé")
+        self.budget -= 1
+        await self.window.acquire()
+        fut = asyncio.get_running_loop().create_future()
+        self.pending.append(fut)
+        self.writer.write(payload)
+        await self.writer.drain()
+        return await fut
+
+    async def encrypt(self, block):
+        self.queries += 1
+        return bytes.fromhex(await self._request(b"1\n" + block.hex().encode() + b"\n"))
+
+    async def get_flag(self):
+        flag_enc = await self._request(b"2\n")
+        return [flag_enc[i:i+32] for i in range(0, len(flag_enc), 32)]
+
+    async def close(self):
+        self.writer.close()
+        if self.proc is not None:
+            self.proc.kill()
+            await self.proc.wait()
+        self.task.cancel()
+
+
+async def recover_block(connect, bl, client=None, blocks=None):
+    # Une session par bloc ; reconnexion quand le budget est épuisé
+    rec = None
+    queries = 0
+    while rec is None or not rec.done():
+        if client is None or client.budget < 1:
+            if client is not None:
+                queries += client.queries
+                await client.close()
+            client = await connect()
+            blocks = await client.get_flag()
+        if rec is None:
+            rec = BlockRecovery(bl, len(blocks))
+        sondes = rec.probes(min(BATCH, client.budget))
+        results = await asyncio.gather(*(client.encrypt(sonde) for sonde in sondes), return_exceptions=True)
+        # Déconnexion en cours de paquet : on garde les réponses reçues avant
+        ok = [r for r in results if not isinstance(r, Exception)]
+        if len(ok) < len(results):
+            results = results[:results.index(next(r for r in results if isinstance(r, Exception)))]
+            client.budget = 0
+        for pos, b, _ in rec.feed(results, bytes.fromhex(blocks[bl])):
+            print(f"✔️  flag[{16 * bl + pos}] = {b:#02x} ('{chr(b)}')")
+    queries += client.queries
+    await client.close()
+    return rec.plaintext(), queries
+
+
+async def main(local=False, window=WINDOW):
+    t0 = time.time()
+    if local:
+        connect = lambda: SaturnClient.local(window)
+    else:
+        connect = lambda: SaturnClient.tcp(HOST, PORT, window)
+    client = await connect()
+    blocks = await client.get_flag()
+    print(f"[+] Flag chiffré : {''.join(blocks)}")
+    # === Tous les blocs sur la même boucle : le bloc 0 réutilise la première session ===
+    resultats = await asyncio.gather(recover_block(connect, 0, client, blocks),
+                                     *(recover_block(connect, bl) for bl in range(1, len(blocks))))
+    flag = b"".join(clair for clair, _ in resultats)
+    if 1 <= flag[-1] <= 16:
+        flag = flag[:-flag[-1]]  # retrait du padding PKCS#7
+    print(f"[+] Flag : {flag.decode(errors='replace')}")
+    print(f"[*] {sum(q for _, q in resultats)} requêtes oracle, {len(blocks)} blocs en {time.time() - t0:.2f} s")
+    return flag
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Client asyncio pour l'oracle Saturn")
+    ap.add_argument("--local", action="store_true", help="lance SaturnCipher.py en sous-processus")
+    ap.add_argument("--window", type=int, default=WINDOW, help="requêtes en vol par session")
+    args = ap.parse_args()
+    asyncio.run(main(args.local, args.window))
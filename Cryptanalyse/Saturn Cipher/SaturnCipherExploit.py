@@ -1,7 +1,11 @@
 import os
+import sys
+import time
+import numpy as np
 from Crypto.Util.Padding import pad
 
-FLAG = open("flag.txt", "rb").read()
+HERE = os.path.dirname(os.path.abspath(__file__))
+FLAG = open(os.path.join(HERE, "flag.txt"), "rb").read()   # importable depuis un autre répertoire
 
 class Saturn:
     def __init__(self, k):
@@ -26,6 +30,7 @@ class Saturn:
         ]
         self.perm = [6, 0, 4, 5, 15, 1, 14, 11, 2, 12, 9, 13, 8, 10, 7, 3]
         self.N = 1337
+        self.buildFused()
 
     def AddKey(self, state):
         return bytes([x ^ y for x, y in zip(state, self.key)])
@@ -45,6 +50,34 @@ class Saturn:
             state = self.Permute(state)
         return state
 
+    # === Moteur rapide : tables fusionnées (AddKey + SubBytes + Permute) ===
+    def buildFused(self):
+        # La sortie i d'un tour vaut S[state[perm[i]] ^ key[perm[i]]] :
+        # une table de 256 octets par position, déjà indexée par la permutation
+        self.fused = [(i, self.perm[i], bytes(self.S[x ^ self.key[self.perm[i]]] for x in range(256)))
+                      for i in range(16)]
+
+    def EncryptFast(self, x):
+        # Deux tampons alternés : aucune allocation pendant les 1337 tours
+        cur = bytearray(x[:16])
+        nxt = bytearray(16)
+        fused = self.fused
+        for _ in range(self.N):
+            for i, j, T in fused:
+                nxt[i] = T[cur[j]]
+            cur, nxt = nxt, cur
+        return bytes(cur)
+
+    # === Chiffrement vectorisé d'une matrice (N, 16) de blocs uint8 ===
+    def encrypt_many(self, blocks):
+        S = np.array(self.S, dtype=np.uint8)
+        key = np.frombuffer(bytes(self.key), dtype=np.uint8)
+        perm = np.array(self.perm, dtype=np.intp)
+        state = np.array(blocks, dtype=np.uint8).reshape(-1, 16)
+        for _ in range(self.N):
+            state = S[state ^ key][:, perm]
+        return state
+
 
 # Inverse operations
 def inverse_permutation(state, perm):
@@ -59,6 +92,160 @@ def inverse_sbox(state, S):
         inv_s[s] = i
     return bytes([inv_s[b] for b in state])
 
+# === Précalcul par cycles de la permutation ===
+# Un tour donne new[i] = F_perm[i](old[perm[i]]) avec F_j(x) = S[x ^ key[j]].
+# Après N tours, l'octet i ne dépend que de l'octet source perm^N(i) :
+# Encrypt(x)[i] == table[i][x[source[i]]], table = composée des F_j le long du cycle.
+IDENTITE = bytes(range(256))
+
+def perm_cycles(perm):
+    vus, cycles = set(), []
+    for i in range(len(perm)):
+        cycle, j = [], i
+        while j not in vus:
+            vus.add(j)
+            cycle.append(j)
+            j = perm[j]
+        if cycle:
+            cycles.append(cycle)
+    return cycles
+
+def compose(f, g):
+    # (f o g)[x] = f[g[x]]
+    return bytes([f[y] for y in g])
+
+def compose_pow(f, n):
+    # f o f o ... o f (n fois) par exponentiation rapide
+    r = IDENTITE
+    while n > 0:
+        if n & 1:
+            r = compose(r, f)
+        f = compose(f, f)
+        n >>= 1
+    return r
+
+def cycle_tables(S, perm, key, N, cycle):
+    # Tables composites des positions d'un cycle : n'utilise que key[j], j dans le cycle
+    F = {j: bytes([S[x ^ key[j]] for x in range(256)]) for j in cycle}
+    q, r = divmod(N, len(cycle))
+    tables = {}
+    for i in cycle:
+        C, R, j = IDENTITE, IDENTITE, i
+        for step in range(len(cycle)):
+            j = perm[j]
+            C = compose(C, F[j])
+            if step + 1 == r:
+                R, source = C, j
+        if r == 0:
+            source = i
+        tables[i] = (source, compose(compose_pow(C, q), R))
+    return tables
+
+def composite_tables(S, perm, key, N=1337):
+    tables = {}
+    for cycle in perm_cycles(perm):
+        tables.update(cycle_tables(S, perm, key, N, cycle))
+    return [tables[i] for i in range(16)]
+
+def encrypt_tables(tables, x):
+    # 16 lectures de table au lieu de 1337 tours
+    return bytes([T[x[source]] for source, T in tables])
+
+# === Mode recover_key : quelques clairs choisis puis rencontre au milieu ===
+# Avec T_i la table composite de la sortie i et a = perm[i] :
+#     T_i o F_b == F_a o T_a   avec b = perm^N(a)
+# Sur les clairs constants v*16 on connaît T_i(v) = chiffre_v[i] pour tout i, donc
+# pour chaque candidat k_b, chaque y utilisable donne directement
+#     k_a = S^-1[T_i(S[y ^ k_b])] ^ T_a(y)
+# Un k_b est retenu si tous les y donnent le même k_a. On enchaîne ensuite ces
+# relations k_b -> k_a le long du cycle de perm^N.
+def source_positions(perm, N):
+    source = list(range(16))
+    for _ in range(N):
+        source = [perm[j] for j in source]
+    return source
+
+def key_relation(S, inv_s, chiffres, i, a):
+    # Pour chaque k_b : ensemble des k_a compatibles (None = aucune contrainte)
+    relation = {}
+    for kb in range(256):
+        ka = set()
+        for y in chiffres:
+            z = S[y ^ kb]
+            if z in chiffres:
+                ka.add(inv_s[chiffres[z][i]] ^ chiffres[y][a])
+        if len(ka) <= 1:
+            relation[kb] = ka or None
+    return relation
+
+def recover_key(oracle, S, perm, N=1337, m=48):
+    # oracle(bloc) -> chiffré : m requêtes au total
+    chiffres = {v: oracle(bytes([v] * 16)) for v in range(m)}
+    inv_s = [0] * 256
+    for i, s in enumerate(S):
+        inv_s[s] = i
+    source = source_positions(perm, N)
+    relations = {}
+    for i in range(16):
+        a = perm[i]
+        relations[a] = key_relation(S, inv_s, chiffres, i, a)
+    # Arête source[a] -> a : on parcourt le cycle de perm^N à partir de la position 0
+    suivant = {source[a]: a for a in range(16)}
+    for k0 in range(256):
+        partiels = [{0: k0}]
+        for _ in range(15):
+            nouveaux = []
+            for cle in partiels:
+                b = list(cle)[-1]
+                ka = relations[suivant[b]].get(cle[b], set())
+                for k in (range(256) if ka is None else ka):
+                    nouveaux.append({**cle, suivant[b]: k})
+            partiels = nouveaux
+        for cle in partiels:
+            key = bytes(cle[j] for j in range(16))
+            if Saturn(key).EncryptFast(bytes(16)) == chiffres[0]:
+                return key, len(chiffres)
+    return None, len(chiffres)
+
+class SaturnDecryptor:
+    # === Déchiffrement vectorisé : tables inverses construites une seule fois ===
+    # Tour inverse sur la colonne j : S^-1[state[inv_perm[j]]] ^ key[j], fusionné en T[j, .]
+    def __init__(self, key, S, perm, N=1337):
+        self.N = N
+        inv_s = np.zeros(256, dtype=np.uint8)
+        inv_s[np.array(S)] = np.arange(256, dtype=np.uint8)
+        self.inv_perm = np.argsort(np.array(perm)).astype(np.intp)
+        k = np.frombuffer(bytes(key), dtype=np.uint8)
+        self.T = inv_s[np.newaxis, :] ^ k[:, np.newaxis]
+        self.cols = np.arange(16)
+
+    def decrypt_many(self, blocks):
+        state = np.array(blocks, dtype=np.uint8).reshape(-1, 16)
+        T, cols, inv_perm = self.T, self.cols, self.inv_perm
+        for _ in range(self.N):
+            state = T[cols, state[:, inv_perm]]
+        return state
+
+    def decrypt(self, data):
+        # Flux chiffré quelconque (multiple de 16 octets) -> clair
+        blocks = np.frombuffer(bytes(data), dtype=np.uint8).reshape(-1, 16)
+        return self.decrypt_many(blocks).tobytes()
+
+def main_recover_key():
+    key = os.urandom(16)
+    s = Saturn(key)
+    print("[*] Clé secrète réelle :", key.hex())
+    padded_flag = pad(FLAG, 16)
+    flag_blocks = [padded_flag[i:i+16] for i in range(0, len(padded_flag), 16)]
+    enc_blocks = list(map(s.EncryptFast, flag_blocks))
+    print("Flag crypté >", b"".join(enc_blocks).hex())
+
+    t0 = time.time()
+    guess, queries = recover_key(s.EncryptFast, s.S, s.perm, s.N)
+    print(f"[+] Clé retrouvée : {guess.hex()} ({queries} requêtes, {time.time() - t0:.2f} s)")
+    clair = SaturnDecryptor(guess, s.S, s.perm, s.N).decrypt(b"".join(enc_blocks))
+    print("[+] Flag :", clair)
+
 #if __name__ == "__main__":
 def original():
     nb_enc = 300
@@ -120,31 +307,32 @@ def main():
     print("                                 ")
     padded_flag = pad(FLAG, 16)
     flag_blocks = [padded_flag[i:i+16] for i in range(0, len(padded_flag), 16)]
-    enc_blocks = list(map(s.Encrypt, flag_blocks))
+    enc_blocks = list(map(s.EncryptFast, flag_blocks))
     flagCrypte =  b"".join(enc_blocks)
     print("Flag crypté >", flagCrypte.hex())
 
-    for p in range(15):
-        c = []
-        for b in range(2):
-            test = "00" * p + bytes([b]).hex() + "00" * (16 - p)  # 1 byte fixé, le reste à 0
-            block = bytes.fromhex(test)
-            ciphertext = s.Encrypt(block)
-            c.append(ciphertext)
-            print(test, "-", block, " - ", ciphertext.hex())
-
-        print("\nDifférences byte par byte :")
-        for i, (b1, b2) in enumerate(zip(c[0], c[1])):
-            if b1 != b2:
-                print(f"Byte pos {p} -> #{i}: {b1:02x} → {b2:02x}  |  flagCrypte[{i}] = {flagCrypte[i]:02x}")
-                for b in range(0, 257):
-                    test = "00" * p + bytes([b]).hex() + "00" * (16 - p)  # 1 byte fixé, le reste à 0
-                    block = bytes.fromhex(test)
-                    ciphertext = s.Encrypt(block)
-                    ci = ciphertext[i]
-                    if ci == flagCrypte[i]:
-                        print(f"✔️  flag[{p}] = {b:#02x} ('{chr(b)}')")
-                        break
+    # === Précalcul par cycles : vérification contre le moteur complet ===
+    print("[*] Cycles de perm :", perm_cycles(s.perm))
+    tables = composite_tables(s.S, s.perm, key, s.N)
+    assert list(map(lambda blk: encrypt_tables(tables, blk), flag_blocks)) == enc_blocks
+    print("[+] Tables composites conformes à EncryptFast")
+
+    # === Dictionnaire local 16 x 256 construit en un seul appel ===
+    # Ligne p*256 + b : octet p fixé à b, le reste à 0
+    candidats = np.zeros((16 * 256, 16), dtype=np.uint8)
+    candidats[np.arange(16 * 256), np.repeat(np.arange(16), 256)] = np.tile(np.arange(256), 16)
+    chiffres = s.encrypt_many(candidats).reshape(16, 256, 16)
+
+    for p in range(16):
+        c0, c1 = chiffres[p, 0], chiffres[p, 1]
+        print(f"\nPos {p} : {bytes(c0).hex()} / {bytes(c1).hex()}")
+        print("Différences byte par byte :")
+        for i in np.nonzero(c0 != c1)[0]:
+            print(f"Byte pos {p} -> #{i}: {c0[i]:02x} → {c1[i]:02x}  |  flagCrypte[{i}] = {flagCrypte[i]:02x}")
+            match = np.nonzero(chiffres[p, :, i] == flagCrypte[i])[0]
+            if len(match):
+                b = int(match[0])
+                print(f"✔️  flag[{p}] = {b:#02x} ('{chr(b)}')")
     
 
 
@@ -163,4 +351,7 @@ def main():
     #print("[=] Clé correcte ? ", "O" if guess_key == key else "N")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if sys.argv[1:] == ["recover_key"]:
+        main_recover_key()
+    else:
+        main()
\ No newline at end of file
@@ -1,8 +1,14 @@
 from pwn import *
+from concurrent.futures import ProcessPoolExecutor
+import sqlite3
+from SaturnCipherScheduler import BUDGET, BATCH, BlockRecovery
 
 # === Paramètres du serveur ===
 HOST = "challenges.404ctf.fr"
 PORT = 30169
+HERE = os.path.dirname(os.path.abspath(__file__))
+CACHE_DB = os.path.join(HERE, "saturn_oracle_cache.sqlite")
+DB_TIMEOUT = 30     # s d'attente du verrou SQLite (workers de PARALLEL sur le même fichier)
 
 
 def getFlagEncored(p):
@@ -27,92 +33,259 @@ def getFlagEncored(p):
         exit()
 
 # Dictionnaire pour stocker les résultats en cache
+class OracleCache:
+    # === Cache disque (SQLite, ajout seul) indexé par l'empreinte de session ===
+    # L'empreinte est le flag chiffré : même empreinte <=> même clé côté serveur
+    def __init__(self, path, fingerprint):
+        self.db = sqlite3.connect(path, timeout=DB_TIMEOUT)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS oracle (fingerprint TEXT, test TEXT, result TEXT,
+                                               PRIMARY KEY (fingerprint, test));
+            CREATE TABLE IF NOT EXISTS byte_cost (fingerprint TEXT, bloc INTEGER, pos INTEGER, queries REAL);
+        """)
+        self.fingerprint = fingerprint
+        self.data = dict(self.db.execute("SELECT test, result FROM oracle WHERE fingerprint = ?", (fingerprint,)))
+        self.queries = 0
+        if self.data:
+            print(f"[+] Session déjà vue : {len(self.data)} réponses rechargées du cache")
 
-def sendTestValue(p, test, cache):
-    if test in cache:
-        #print(f"Valeur trouvée dans le cache pour test = {test}")
-        return cache[test]
+    def __contains__(self, test):
+        return test in self.data
 
-    try:
-        bytes.fromhex(test)
-    except:
-        print("[-] Format hex invalide.")
-        return None
-    # Envoyer '1' pour mode chiffrage
-    p.recvuntil(b"(2) ? >")
-    #print("[-] send 1.  -> chiffrer")
-    p.sendline(b"1")
-    p.recvuntil(b"chiffrer >")
-    #print("[-] -value ", test, " - ", len(test))
+    def __getitem__(self, test):
+        return self.data[test]
 
-    p.sendline(test.encode())
+    def __setitem__(self, test, result):
+        self.data[test] = result
+        self.queries += 1
+        self.db.execute("INSERT OR IGNORE INTO oracle VALUES (?, ?, ?)", (self.fingerprint, test, result))
 
-    # Lire le résultat du chiffrage
-    line = p.recvline().decode()
-    if "> " in line:
-        result = line.split("> ")[1].strip()
-        # Stocker le résultat dans le cache
-        cache[test] = result
-        return result
-    else:
-        print("[!] Pas de réponse valide : ", line)
-    return None
+    def commit(self):
+        self.db.commit()
 
-def main():
-    cache = {}
-    # === Connexion initiale ===
-    p = remote(HOST, PORT)
+    def record(self, bl, pos, queries):
+        # Requêtes oracle imputées à un octet (part des paquets qui l'ont révélé)
+        self.db.execute("INSERT INTO byte_cost VALUES (?, ?, ?, ?)", (self.fingerprint, bl, pos, queries))
+        self.db.commit()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+def printCosts(path=CACHE_DB):
+    db = sqlite3.connect(path)
+    print("[*] Requêtes oracle par session :")
+    for fingerprint, n in db.execute("SELECT fingerprint, COUNT(*) FROM oracle GROUP BY fingerprint"):
+        print(f"    {fingerprint[:32]}… : {n}")
+    print("[*] Requêtes oracle par octet récupéré (chaque paquet partagé entre les octets qu'il révèle) :")
+    for bl, pos, queries in db.execute("SELECT bloc, pos, SUM(queries) FROM byte_cost GROUP BY bloc, pos ORDER BY bloc, pos"):
+        print(f"    bloc {bl} pos {pos:2d} : {queries:.2f}")
+    moyenne = db.execute("SELECT AVG(queries) FROM byte_cost").fetchone()[0]
+    if moyenne is not None:
+        print(f"[*] Moyenne : {moyenne:.2f} requêtes / octet")
+    db.close()
+
+def connect():
+    # === LOCAL : SaturnCipher.py lancé en sous-processus, même API que remote ===
+    if args.LOCAL:
+        p = process([sys.executable, "SaturnCipher.py"], cwd=HERE)
+    else:
+        p = remote(HOST, PORT)
     blocks = getFlagEncored(p)
-    bl = 0
-    bloc = bytes.fromhex(blocks[bl])
-    pos = 0
-    cumulflag = ""
-    while pos < 16:
-        c = []
+    return p, blocks, BUDGET - 1, OracleCache(CACHE_DB, "".join(blocks))
+
+def sendTestValue(p, test, cache):
+    results, _ = sendTestValues(p, [test], cache)
+    return results[0] if results else None
+
+def sendTestValues(p, tests, cache):
+    # === Mode pipeline : N sélections + N blocs écrits d'un coup, N réponses lues dans l'ordre ===
+    todo = [t for t in dict.fromkeys(tests) if t not in cache]
+    for test in todo:
         try:
-            for b in range(2):
-                test = "00" * pos + bytes([b]).hex() + "00" * (15 - pos)  # 1 byte fixé, le reste à 0
-                result = sendTestValue(p, test, cache)
-                c.append( bytes.fromhex(result))
-                print(f"[+] Chiffré : {test} - {result}")
-            print("\nDifférences byte par byte :")
-            for i, (b1, b2) in enumerate(zip(c[0], c[1])):
-                if b1 != b2:
-                    print(f"Byte pos {pos} -> #{i}: {b1:02x} → {b2:02x}  |  flagCrypte[{i}] = {bloc[i]:02x}")
-                    for b in range(0, 256):
-                        test = "00" * pos + bytes([b]).hex() + "00" * (15 - pos)  # 1 byte fixé, le reste à 0
-                        result = sendTestValue(p, test, cache)
-                        cipher = bytes.fromhex(result)
-                        ci = cipher[i]
-                        if ci == bloc[i]:
-                            cumulflag += chr(b)
-                            print(f"✔️  flag[{pos}] = {b:#02x} ('{chr(b)}') : {cumulflag}")
-                            break
-        
-            pos += 1
-            if pos > 15 and bl < 3:
-                pos = 0
-                bl+=1
-                print("Changement de bloc :", bl)
-                p.close()
-                cache = {}
-                p = remote(HOST, PORT)
-                blocks = getFlagEncored(p)
-                bloc = bytes.fromhex(blocks[bl])
+            assert len(bytes.fromhex(test)) == 16
+        except:
+            print("[-] Format hex invalide :", test)
+            return None, 0
+    if todo:
+        p.send(b"".join(b"1\n" + t.encode() + b"\n" for t in todo))
+        reponses = []
+        for test in todo:
+            p.recvuntil("chiffré >".encode())
+            reponses.append(p.recvline().decode().strip())
+        # Écriture après le réseau, un commit par paquet : le verrou SQLite n'est pas gardé
+        # pendant l'attente des réponses (les autres sessions de PARALLEL écrivent aussi)
+        for test, result in zip(todo, reponses):
+            cache[test] = result
+        cache.commit()
+    return [cache[t] for t in tests], len(todo)
 
+class Session:
+    # === Connexion + budget + cache : reconnecte quand le budget est épuisé ===
+    def __init__(self):
+        self.queries = 0
+        self.connect()
+
+    def connect(self):
+        self.p, self.blocks, self.budget, self.cache = connect()
+
+    def reconnect(self):
+        print("[-] Session épuisée ou déconnexion. Reconnexion...")
+        self.close()
+        time.sleep(1)  # Attendre un peu avant de se reconnecter
+        self.connect()
+
+    def send(self, tests):
+        return sendTestValues(self.p, tests, self.cache)
+
+    def encrypt(self, tests):
+        # Renvoie (chiffrés, blocs du flag) pour une même clé ; peut traiter moins de tests que demandé
+        if self.budget < 1:
+            self.reconnect()
+        tests = tests[:self.budget]
+        try:
+            results, used = self.send(tests)
         except EOFError:
-            print("[-] Déconnexion détectée. Tentative de reconnexion et purge du cache...")
-            time.sleep(1)  # Attendre un peu avant de se reconnecter
-            cache = {}
-            p = remote(HOST, PORT)
-            blocks = getFlagEncored(p)
-            bloc = bytes.fromhex(blocks[bl])
-        except Exception as e:
-            print(f"[-] Erreur inattendue: {e}")
-            return None
+            self.reconnect()
+            return [], self.blocks
+        self.budget -= used
+        self.queries += used
+        return results, self.blocks
 
+    def record(self, bl, pos, queries):
+        self.cache.record(bl, pos, queries)
 
+    def close(self):
+        self.p.close()
+        self.cache.close()
 
-# === Fermer proprement ===
-main()
-p.close()
\ No newline at end of file
+def recoverBlock(session, bl, verbose=True):
+    rec = BlockRecovery(bl, len(session.blocks))
+    for pos, b in enumerate(rec.clair):
+        if b is not None:
+            session.record(bl, pos, 0)     # préfixe connu
+    attente = 0     # requêtes pas encore imputées : paquets qui n'ont rien révélé
+    while not rec.done():
+        tests = [sonde.hex() for sonde in rec.probes(BATCH)]
+        avant = session.queries
+        results, blocks = session.encrypt(tests)
+        attente += session.queries - avant
+        trouves = rec.feed([bytes.fromhex(r) for r in results], bytes.fromhex(blocks[bl]))
+        for pos, b, _ in trouves:
+            session.record(bl, pos, attente / len(trouves))
+            if verbose:
+                print(f"✔️  flag[{16 * bl + pos}] = {b:#02x} ('{chr(b)}')")
+        if trouves:
+            attente = 0
+    return rec.plaintext()
+
+def showFlag(flag, queries):
+    if 1 <= flag[-1] <= 16:
+        flag = flag[:-flag[-1]]  # retrait du padding PKCS#7
+    print(f"[+] Flag : {flag.decode(errors='replace')}")
+    print(f"[*] {queries} requêtes oracle pour {len(flag)} octets")
+    return flag
+
+def main():
+    # === Connexion initiale ===
+    session = Session()
+    flag = b""
+    for bl in range(len(session.blocks)):
+        print("Bloc :", bl)
+        flag += recoverBlock(session, bl)
+        print(f"[+] {flag}")
+
+    # === Fermer proprement ===
+    session.close()
+    return showFlag(flag, session.queries)
+
+def recoverBlockWorker(bl):
+    # Une session, donc un budget de 300 chiffrements, par bloc
+    session = Session()
+    try:
+        return recoverBlock(session, bl), session.queries
+    finally:
+        session.close()
+
+def mainParallel():
+    # === Tous les blocs en parallèle : le processus principal garde le bloc 0 ===
+    t0 = time.time()
+    session = Session()
+    nbBlocks = len(session.blocks)
+    with ProcessPoolExecutor(max_workers=max(nbBlocks - 1, 1)) as pool:
+        futures = [pool.submit(recoverBlockWorker, bl) for bl in range(1, nbBlocks)]
+        resultats = [(recoverBlock(session, 0), session.queries)]
+        session.close()
+        resultats += [f.result() for f in futures]
+    flag = b"".join(clair for clair, _ in resultats)
+    print(f"[*] {nbBlocks} blocs en {time.time() - t0:.1f} s")
+    return showFlag(flag, sum(queries for _, queries in resultats))
+
+# === Banc d'essai local : oracle simulé, sans réseau ===
+class LocalSession(Session):
+    def __init__(self, flag):
+        self.flag = flag
+        super().__init__()
+
+    def connect(self):
+        from Crypto.Util.Padding import pad
+        from SaturnCipherExploit import Saturn    # moteur EncryptFast, sans serveur
+        self.saturn = Saturn(os.urandom(16))
+        padded = pad(self.flag, 16)
+        self.blocks = [self.saturn.EncryptFast(padded[i:i+16]).hex() for i in range(0, len(padded), 16)]
+        self.budget = BUDGET - 1
+        self.cache = {}
+
+    def reconnect(self):
+        self.connect()
+
+    def send(self, tests):
+        todo = [t for t in dict.fromkeys(tests) if t not in self.cache]
+        for t in todo:
+            self.cache[t] = self.saturn.EncryptFast(bytes.fromhex(t)).hex()
+        return [self.cache[t] for t in tests], len(todo)
+
+    def record(self, bl, pos, queries):
+        pass
+
+    def close(self):
+        pass
+
+BENCH_FLAGS = [
+    b"404CTF{fake}",
+    b"404CTF{fake}\n",
+    b"404CTF{S4turn_n_4_p4s_d3_d1ffus10n}",
+    b"404CTF{th3_r1ngs_0f_s4turn_4r3_1ndep3nd4nt}",
+    b"404CTF{p3rmut4t10n_w1th0ut_m1x1ng_1s_n0t_4_c1ph3r}",
+    b"404CTF{un_0ct3t_4_l4_f01s}",
+    b"404CTF{1337_r0unds_but_0n3_byt3_4t_4_t1m3}",
+    b"404CTF{S4turn_n_4_p4s_d3_d1ffus10n}\n",
+    b"404CTF{p4dd1ng_0r_n0t}\r\n",
+]
+
+def bench():
+    from Crypto.Util.Padding import pad
+    total_adapt, total_lin, total_octets = 0, 0, 0
+    for flag in BENCH_FLAGS:
+        session = LocalSession(flag)
+        clair = b"".join(recoverBlock(session, bl, verbose=False) for bl in range(len(session.blocks)))
+        assert clair == pad(flag, 16), clair
+        # Ancienne boucle : 2 sondes de diff puis b = 0..v (0 et 1 déjà en cache)
+        lineaire = sum(2 + max(v - 1, 0) for v in clair)
+        print(f"[*] {flag.decode()!r} : {session.queries} requêtes (adaptatif) / {lineaire} (linéaire)")
+        total_adapt += session.queries
+        total_lin += lineaire
+        total_octets += len(clair)
+    print(f"[+] Moyenne adaptatif : {total_adapt / total_octets:.2f} requêtes / octet")
+    print(f"[+] Moyenne linéaire  : {total_lin / total_octets:.2f} requêtes / octet")
+
+
+if __name__ == "__main__":
+    if args.STATS:
+        printCosts()
+    elif args.BENCH:
+        bench()
+    elif args.PARALLEL:
+        mainParallel()
+    else:
+        main()
@@ -0,0 +1,120 @@
+# Ordonnanceur de sondes pour l'oracle Saturn, sans dépendance réseau :
+# partagé par SaturnCipherNetcat.py (pwntools) et SaturnCipherAsync.py (asyncio).
+
+BUDGET = 300    # chiffrements autorisés par session (la demande du flag en consomme un)
+BATCH = 16      # sondes envoyées d'un bloc en mode pipeline (chaque sonde teste les 16 positions)
+
+# === Paramètres publics du chiffrement (cf. SaturnCipher.py) ===
+PERM = [6, 0, 4, 5, 15, 1, 14, 11, 2, 12, 9, 13, 8, 10, 7, 3]
+ROUNDS = 1337
+
+# === A priori sur les flags 404CTF{...} ===
+PREFIXE = b"404CTF{"
+FREQ = b"_e3ta4o0i1ns5rhl7dcumfpgywbvkxjqz2689ETAOINSRHLDCUMFPGYWBVKXJQZ}!-?@#$%&*+.,:;=<>()[]^~|' "
+ORDRE = list(FREQ) + [b for b in range(256) if b not in FREQ]
+
+
+def sourceMap(perm=PERM, N=ROUNDS):
+    # Après N tours, l'octet de sortie i ne dépend que de l'octet d'entrée perm^N(i).
+    # C'est l'information du "diff à 2 sondes", indépendante de la clé : calculée une fois.
+    sortie = [0] * 16
+    for i in range(16):
+        j = i
+        for _ in range(N):
+            j = perm[j]
+        sortie[j] = i
+    return sortie
+
+SORTIE = sourceMap()
+
+def candidateOrder(bl, pos, nbBlocks):
+    # Préfixe connu : aucune requête
+    if bl == 0 and pos < len(PREFIXE):
+        return [PREFIXE[pos]]
+    if bl == nbBlocks - 1:
+        # Dernier bloc : '}' puis les valeurs de padding PKCS#7 possibles à cette position
+        tete = [ord("}")] + list(range(16 - pos, 17))
+        return tete + [b for b in ORDRE if b not in tete]
+    return ORDRE
+
+def deducePadding(clair, restants):
+    # Un '}' ou un octet de padding fixe toute la fin du dernier bloc, mais ce n'est qu'une
+    # hypothèse (un flag peut finir par "}\n") : restants[pos] liste les candidats pas encore
+    # écartés. Renvoie {pos: octet} de la première hypothèse compatible, à confirmer par requête.
+    for q, v in enumerate(clair):
+        if v == ord("}"):
+            n = 15 - q
+        elif v is not None and 1 <= v <= 16 and q >= 16 - v:
+            n = v
+        else:
+            continue
+        attendu = {r: n for r in range(16 - n, 16)}
+        if n < 16:
+            attendu[15 - n] = ord("}")
+        if all(b in restants[r] if clair[r] is None else clair[r] == b for r, b in attendu.items()):
+            devine = {r: b for r, b in attendu.items() if clair[r] is None}
+            if devine:
+                return devine
+    return {}
+
+class BlockRecovery:
+    # === Récupération adaptative d'un bloc ===
+    # Chaque sonde place le prochain candidat de chaque position encore inconnue :
+    # l'octet de sortie sortie[pos] ne dépend que de pos, on teste 16 positions par requête.
+    # Dernier bloc : la fin déduite du padding part dans la première sonde suivante (bloc
+    # complété) et n'est acceptée que si les octets de sortie correspondants concordent.
+    def __init__(self, bl, nbBlocks, sortie=SORTIE):
+        self.bl = bl
+        self.last = bl == nbBlocks - 1
+        self.sortie = sortie
+        self.ordres = [candidateOrder(bl, pos, nbBlocks) for pos in range(16)]
+        self.clair = [o[0] if len(o) == 1 else None for o in self.ordres]
+        self.rang = [0] * 16
+        self.devine = {}    # hypothèse de padding en attente de confirmation
+
+    def done(self):
+        if self.last and not self.devine:
+            self.devine = deducePadding(self.clair, [o[r:] for o, r in zip(self.ordres, self.rang)])
+        return None not in self.clair
+
+    def probes(self, k):
+        # Les k prochaines sondes, sans les envoyer
+        clair, ordres, rang, devine = self.clair, self.ordres, self.rang, self.devine
+        if devine and all(clair[pos] is not None or pos in devine for pos in range(16)):
+            k = 1   # il ne reste que la confirmation
+        def octet(pos, j):
+            if clair[pos] is not None:
+                return clair[pos]
+            if pos in devine:
+                return devine[pos]
+            return ordres[pos][min(rang[pos] + j, len(ordres[pos]) - 1)]
+        return [bytes(octet(pos, j) for pos in range(16)) for j in range(k)]
+
+    def feed(self, results, bloc):
+        # results : chiffrés des premières sondes de probes(), dans l'ordre ;
+        # bloc : bloc du flag chiffré sous la même clé. Renvoie [(pos, octet, rang)] trouvés.
+        ouverts = [pos for pos in range(16) if self.clair[pos] is None and pos not in self.devine]
+        trouves = []
+        if results and self.devine:
+            # La première sonde portait l'hypothèse : chaque position se confirme séparément,
+            # une valeur réfutée est retirée des candidats et la position est resondée
+            for pos, b in self.devine.items():
+                i, r = self.sortie[pos], self.rang[pos]
+                if results[0][i] == bloc[i]:
+                    self.clair[pos] = b
+                    trouves.append((pos, b, 0))
+                else:
+                    self.ordres[pos] = self.ordres[pos][:r] + [x for x in self.ordres[pos][r:] if x != b]
+            self.devine = {}
+        for k, c in enumerate(results):
+            for pos in ouverts:
+                i, r = self.sortie[pos], self.rang[pos] + k
+                if self.clair[pos] is None and r < len(self.ordres[pos]) and c[i] == bloc[i]:
+                    self.clair[pos] = self.ordres[pos][r]
+                    trouves.append((pos, self.clair[pos], r + 1))
+        for pos in ouverts:
+            self.rang[pos] += len(results)
+        return trouves
+
+    def plaintext(self):
+        return bytes(self.clair)